@@ -0,0 +1,29 @@
+"""
+Converts the data file of the experiment to its columnar cache (see
+parsers/columnar_cache.py), from which the generator and the processor's
+offline paths read the events afterwards. It is needed once per data file.
+Run from the engine's directory with the experiment's environment, e.g.:
+    env $(cat env | xargs) python -m experiments.build_columnar_cache
+"""
+import time
+
+from experiments.configurations_map import filename, data_to_col_names, \
+    data_to_col_types
+from experiments.consts import *
+from parsers.columnar_cache import ColumnarCache
+
+
+def build_cache():
+    data_file = f'{ORIGIN_DATA_DIR}/{filename}'
+    start = time.time()
+    cache = ColumnarCache.build(data_file,
+                                data_to_col_names.get(DATASET_KIND),
+                                data_to_col_types.get(DATASET_KIND),
+                                WITH_WS)
+    print(f'cached {cache.size} events of {len(cache.types_names)} event '
+          f'types in {ColumnarCache.get_cache_dir(data_file)}, '
+          f'{time.time() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    build_cache()
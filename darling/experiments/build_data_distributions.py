@@ -0,0 +1,148 @@
+"""
+Computes the distribution parameters ([mu, sigma]) of the attributes of the
+event types of patterns from a dataset file, which may be gzipped, and
+writes them to datasets/data_distributions.json under the keys the
+experiments look them up by (see Parser.get_dist_filename). The other
+entries of the file are kept.
+The dataset is read once: it is streamed in chunks, every chunk is reduced
+by a pool of processes to Welford accumulators of its event types, and the
+accumulators of the chunks are merged.
+Run from the engine's directory with the experiment's environment, e.g.:
+    env $(cat env | xargs) python -m experiments.build_data_distributions \
+        full-game.gz 'SEQ(61 a, 8 b, 13 c) WHERE ... WITHIN ...' ...
+(without patterns, the PATTERN of the environment is used, and without a
+dataset file, its data file).
+"""
+import collections
+import json
+import multiprocessing
+import sys
+import time
+import typing
+
+import numpy as np
+
+from experiments.configurations_map import dist_path, filename, \
+    data_to_col_names
+from experiments.consts import *
+from experiments.preprocess_dataset import NUM_WORKERS, read_chunks
+from parsers.parser import Parser
+
+
+class WelfordAccumulator:
+    """
+    This class keeps the count, the mean and the sum of squared differences
+    from the mean (M2) of the attributes of an event type. Batches of values
+    and the accumulators of other chunks of the dataset are merged into it by
+    the parallel form of Welford's algorithm, so the parameters are computed
+    in one numerically stable pass
+    """
+    def __init__(self, attrs_num: int):
+        self.count = 0
+        self.mean = np.zeros(attrs_num)
+        self.m2 = np.zeros(attrs_num)
+
+    def _merge(self, count: int, mean: np.ndarray, m2: np.ndarray):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def add_values(self, values: np.ndarray):
+        """
+        Adds a batch of values, a row per event
+        """
+        if len(values):
+            mean = values.mean(axis=0)
+            self._merge(len(values), mean,
+                        ((values - mean) ** 2).sum(axis=0))
+
+    def merge(self, other: 'WelfordAccumulator'):
+        if other.count:
+            self._merge(other.count, other.mean, other.m2)
+
+    def get_params(self) -> typing.List[typing.List[float]]:
+        """
+        Returns [mu, sigma] of every attribute
+        """
+        sigma = np.sqrt(self.m2 / self.count)
+        return [[mu, s] for mu, s in zip(self.mean.tolist(), sigma.tolist())]
+
+
+def _parse_values(lines: typing.List[typing.List[bytes]]) -> np.ndarray:
+    try:
+        return np.array(lines, dtype=np.float64)
+    except ValueError:
+        # empty attributes are zero, as in parsing text
+        return np.array([[value or b'0' for value in line] for line in lines],
+                        dtype=np.float64)
+
+
+def reduce_chunk(chunk: bytes, types_names: typing.Set[bytes],
+                 attrs_num: int) -> typing.Dict[bytes, WelfordAccumulator]:
+    """
+    Returns the accumulator of every given event type in the chunk
+    """
+    type_to_lines = collections.defaultdict(list)
+    for line in chunk.split(b'\n')[:-1]:
+        fields = line.split(b',')
+        type_name = fields[0].strip()
+        if type_name in types_names:
+            # the type and the time precede the attributes, and the window
+            # size may follow them
+            type_to_lines[type_name].append(fields[2:2 + attrs_num])
+    accumulators = {}
+    for type_name, lines in type_to_lines.items():
+        accumulator = accumulators[type_name] = WelfordAccumulator(attrs_num)
+        accumulator.add_values(_parse_values(lines))
+    return accumulators
+
+
+def build_distributions(dataset_file: str, patterns: typing.List[str]):
+    # the time is not an attribute with a distribution
+    attrs_names = data_to_col_names.get(DATASET_KIND)[1:]
+    patterns_types = [Parser.get_data_filename(DATASET_KIND, pattern)[1] for
+                      pattern in patterns]
+    types_names = {type_name.encode() for types in patterns_types for
+                   type_name in types}
+    accumulators = {type_name: WelfordAccumulator(len(attrs_names)) for
+                    type_name in types_names}
+    start = time.time()
+    with multiprocessing.Pool(NUM_WORKERS) as pool:
+        pending = collections.deque()
+        for chunk in read_chunks(dataset_file):
+            pending.append(pool.apply_async(
+                reduce_chunk, (chunk, types_names, len(attrs_names))))
+            while len(pending) > 2 * NUM_WORKERS or (pending and
+                                                     pending[0].ready()):
+                for type_name, accumulator in pending.popleft().get().items():
+                    accumulators[type_name].merge(accumulator)
+        while pending:
+            for type_name, accumulator in pending.popleft().get().items():
+                accumulators[type_name].merge(accumulator)
+    print(f'reduced {dataset_file} in {time.time() - start:.1f}s')
+    with open(dist_path) as f:
+        files_dist = json.load(f)
+    for pattern, types in zip(patterns, patterns_types):
+        dist_filename = Parser.get_dist_filename(DATASET_KIND, pattern)
+        missing = [type_name for type_name in types if
+                   not accumulators[type_name.encode()].count]
+        if missing:
+            print(f'{dist_filename}: no events of the types {missing}')
+            continue
+        files_dist[dist_filename] = {
+            type_name: dict(zip(attrs_names,
+                                accumulators[type_name.encode()].get_params()))
+            for type_name in types}
+        print(f'{dist_filename}: ' + ', '.join(
+            f'{type_name}: {accumulators[type_name.encode()].count} events'
+            for type_name in types))
+    with open(dist_path, 'w') as f:
+        json.dump(files_dist, f)
+
+
+if __name__ == '__main__':
+    build_distributions(
+        sys.argv[1] if len(sys.argv) > 1 else f'{ORIGIN_DATA_DIR}/{filename}',
+        sys.argv[2:] or [os.environ.get('PATTERN')])
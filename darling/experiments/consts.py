@@ -1,82 +1,111 @@
-import os
-
-DATA_SIZE = int(os.getenv('DATA_SIZE', '1000000'))
-EVENT_TYPES = 'event_types'
-PATTERN = 'pattern'
-PATTERN_LEN = 'pattern_len'
-DEFAULT_PATTERN_LEN = 'default_pattern_len'
-DEFAULT_COND_LEN = 'default_cond_len'
-SELECTIVITY = 'conditions_selectivity'
-EXPECTED_RATE = 'event_types_expected_rate'
-ATTRS_DIST_PARAMS = 'attrs_dist_params'
-SORT_DELTA = 'sort_delta'
-MAX_LOAD = 'max_load'
-PORT = int(os.getenv('PORT', '80'))
-IP = os.getenv('IP', 'localhost')
-MAX_LOAD_ARR = 'max_load_arr'
-TIME_ARR = 'time_arr'
-MATCHES_ARR = 'matches_arr'
-SHEDDED_ARR = 'shedded_arr'
-REMOVED_ARR = 'removed_arr'
-PENALIZED_ARR = 'penalized_arr'
-THROUGHPUT_ARR = 'throughput_arr'
-LOAD_SHEDDING_ARR = 'is_load_shedding'
-OVERLOADED_ARR = 'overloaded'
-STATS = [LOAD_SHEDDING_ARR, MAX_LOAD_ARR, TIME_ARR, MATCHES_ARR, SHEDDED_ARR,
-         REMOVED_ARR, PENALIZED_ARR, OVERLOADED_ARR, THROUGHPUT_ARR]
-WITH_LS = 'with load shedding'
-WITHOUT_LS = 'without load shedding'
-THROUGHPUT_DELTA = 'throughput_delta'
-MAX_MATCHES = 'max_matches'
-BOOST = 'boost'  # the peak size
-ALLOW_SLEEPING = 'allow_sleeping'  # for not sleeping when calc #matches
-RAND_INDEX = 'rand_index'  # the index where the peak starts
-BUFFER_SIZES = 'buffer_size'
-VESSLE_A = 'A'
-VESSLE_B = 'B'
-VESSLE_C = 'C'
-STATUS = 'status'
-TURN = 'turn'
-SPEED = 'speed'
-COURSE = 'course'
-HEADING = 'heading'
-LON = 'lon'
-LAT = 'lat'
-
-
-EXPERIMENT_INDEXES = 'experiment_indexes'
-PATTERN_INDEXES = 'pattern_indexes'
-COND_INDEXES = 'condition_indexes'
-
-GOOGLE = 'Google'
-MICROSOFT = 'Microsoft'
-APPLE = 'Apple'
-TIME = 'time'
-SCORE = 'score'
-PRICE = 'price'
-
-MEAN_MAX_LOAD = 'mean_max_load'
-TOTAL_MATCHES = 'total_matches'
-TOTAL_EVENTS = 'total_events'
-COND_LEN = 'condition_len'
-
-NEXT_EVENT_URI = '/next_event'
-NUM_MATCHES_URI = '/num_matches'
-TO_FINISH_URI = '/to_finish'
-START_URI = '/start'
-
-UPDATE_RATE = 2
-
-GOT_MESSAGE = 'OK'
-FINISH = 'FINISH'
-CHECK_FINISHED_WARM_UP = 'CHECK_FINISHED_WARM_UP'
-FINISHED_WARM_UP = 'FINISHED_WARM_UP'
-NOT_FINISHED_WARM_UP = 'NOT_FINISHED_WARM_UP'
-SLEEP_WARM_UP_SEC = 10
-
-SEPARATOR = '|'
-WARM_UP = int(os.environ.get('WARM_UP'))
-STATS_COUNT = min([5000, WARM_UP - 1])
-ATTRS_TYPES = 'attrs_types'
-ORIGIN_DATA_DIR = 'experiments/datasets'
+import os
+
+DATA_SIZE = int(os.getenv('DATA_SIZE', '1000000'))
+EVENT_TYPES = 'event_types'
+PATTERN = 'pattern'
+PATTERN_LEN = 'pattern_len'
+DEFAULT_PATTERN_LEN = 'default_pattern_len'
+DEFAULT_COND_LEN = 'default_cond_len'
+SELECTIVITY = 'conditions_selectivity'
+EXPECTED_RATE = 'event_types_expected_rate'
+ATTRS_DIST_PARAMS = 'attrs_dist_params'
+SORT_DELTA = 'sort_delta'
+MAX_LOAD = 'max_load'
+PORT = int(os.getenv('PORT', '80'))
+IP = os.getenv('IP', 'localhost')
+MAX_LOAD_ARR = 'max_load_arr'
+TIME_ARR = 'time_arr'
+MATCHES_ARR = 'matches_arr'
+SHEDDED_ARR = 'shedded_arr'
+REMOVED_ARR = 'removed_arr'
+PENALIZED_ARR = 'penalized_arr'
+THROUGHPUT_ARR = 'throughput_arr'
+LOAD_SHEDDING_ARR = 'is_load_shedding'
+OVERLOADED_ARR = 'overloaded'
+STATS = [LOAD_SHEDDING_ARR, MAX_LOAD_ARR, TIME_ARR, MATCHES_ARR, SHEDDED_ARR,
+         REMOVED_ARR, PENALIZED_ARR, OVERLOADED_ARR, THROUGHPUT_ARR]
+WITH_LS = 'with load shedding'
+WITHOUT_LS = 'without load shedding'
+THROUGHPUT_DELTA = 'throughput_delta'
+MAX_MATCHES = 'max_matches'
+BOOST = 'boost'  # the peak size
+ALLOW_SLEEPING = 'allow_sleeping'  # for not sleeping when calc #matches
+RAND_INDEX = 'rand_index'  # the index where the peak starts
+BUFFER_SIZES = 'buffer_size'
+VESSLE_A = 'A'
+VESSLE_B = 'B'
+VESSLE_C = 'C'
+STATUS = 'status'
+TURN = 'turn'
+SPEED = 'speed'
+COURSE = 'course'
+HEADING = 'heading'
+LON = 'lon'
+LAT = 'lat'
+
+
+EXPERIMENT_INDEXES = 'experiment_indexes'
+PATTERN_INDEXES = 'pattern_indexes'
+COND_INDEXES = 'condition_indexes'
+
+GOOGLE = 'Google'
+MICROSOFT = 'Microsoft'
+APPLE = 'Apple'
+TIME = 'time'
+SCORE = 'score'
+PRICE = 'price'
+
+MEAN_MAX_LOAD = 'mean_max_load'
+TOTAL_MATCHES = 'total_matches'
+TOTAL_EVENTS = 'total_events'
+COND_LEN = 'condition_len'
+
+NEXT_EVENT_URI = '/next_event'
+NUM_MATCHES_URI = '/num_matches'
+TO_FINISH_URI = '/to_finish'
+START_URI = '/start'
+
+UPDATE_RATE = 2
+
+GOT_MESSAGE = 'OK'
+FINISH = 'FINISH'
+CHECK_FINISHED_WARM_UP = 'CHECK_FINISHED_WARM_UP'
+FINISHED_WARM_UP = 'FINISHED_WARM_UP'
+NOT_FINISHED_WARM_UP = 'NOT_FINISHED_WARM_UP'
+SLEEP_WARM_UP_SEC = 10
+
+SEPARATOR = '|'
+# the maximal number of events the generator sends in one frame, and the
+# number of events the processor lets it send ahead of their consumption
+EVENTS_BATCH_SIZE = int(os.getenv('EVENTS_BATCH_SIZE', '1000'))
+EVENTS_CREDIT = int(os.getenv('EVENTS_CREDIT', '10000'))
+# how often a source waits for room in a full ingest queue of the processor
+INGEST_ROOM_POLL_SEC = 0.001
+# the number of events per second the generator sends in the regular mode
+# (instead of sleeping SLEEP_REG between them), and how long before the
+# deadline of an event the generator stops sleeping and spins
+TARGET_RATE = float(os.getenv('TARGET_RATE', '0'))
+REPLAY_SPIN_SEC = float(os.getenv('REPLAY_SPIN_SEC', '0.001'))
+# a JSON file declaring the load profile of the generator (see
+# shared/load_profile.py)
+LOAD_PROFILE = os.getenv('LOAD_PROFILE')
+# text or binary (fixed size records derived from the attributes types)
+EVENTS_ENCODING = os.getenv('EVENTS_ENCODING', 'text')
+# whether every line of the data file ends with the window size of its event
+WITH_WS = os.getenv('WS') is not None
+# the number of generators sending events to the processor, and the index of
+# a generator among them
+NUM_SOURCES = int(os.getenv('NUM_SOURCES', '1'))
+SOURCE_ID = int(os.getenv('SOURCE_ID', '0'))
+WARM_UP = int(os.environ.get('WARM_UP'))
+# normal (the distributions parameters of the dataset) or empirical (the
+# histograms of the attributes of the events processed in the warm up, with
+# the given number of bins), the model of the attributes the utilities of the
+# events are estimated by
+UTILITY_MODEL = os.getenv('UTILITY_MODEL', 'normal')
+EMPIRICAL_UTILITY_MODEL = 'empirical'
+HISTOGRAM_BINS = int(os.getenv('HISTOGRAM_BINS', '256'))
+STATS_COUNT = min([5000, WARM_UP - 1])
+ATTRS_TYPES = 'attrs_types'
+ORIGIN_DATA_DIR = 'experiments/datasets'
 DATASET_KIND = os.environ.get('DATASET_KIND')
\ No newline at end of file
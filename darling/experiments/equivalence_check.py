@@ -0,0 +1,233 @@
+"""
+Checks that the evaluation finds the same number of matches, and the events
+get the same utilities, as recorded on fixed slices of the mini soccer data
+file. The records of the patterns without a utility model were taken with
+the partial-match storage, indexes, events and buffers the engine started
+with, so every case guards the data structures that replaced them. Every
+case names the requests whose changes it exercises; all of them go through
+the compiled conditions (user-005), the events (user-007), the merge of the
+leaf buffers (user-009) and the utility tables (user-023).
+Every case runs in its own process, since the experiment's environment is
+read on import.
+Run from the darling folder:
+    python -m experiments.equivalence_check [case names...]
+"""
+import builtins
+import os
+import subprocess
+import sys
+
+DATA_FILE = 'mini_soccer.txt'
+BAND_PATTERN = 'SEQ(61 a, 8 b, 13 c) WHERE |a.x - b.x| <= 50000 and ' \
+               'c.v > a.v * 1.2 WITHIN 15000000000 picoseconds'
+EQUALITY_AND_BAND_PATTERN = 'SEQ(61 a, 8 b, 13 c) WHERE b.ay = a.ay and ' \
+                            '|c.z - b.z| <= 400 WITHIN 150000000000 ' \
+                            'picoseconds'
+ENV = {'BETA': '0.8', 'L_MAX': '0.3', 'SLEEP_REG': '0', 'SLEEP_LOAD': '0',
+       'DATASET_KIND': 'soccer', 'WARM_UP': '5000', 'MAX_LATENCY': '1000000',
+       'DATA_FILE': DATA_FILE, 'PSI': '100', 'PORT': '80'}
+# how the events are added: straight to the evaluation mechanism, or
+# received by the processor as text or as binary records
+DIRECT, TEXT, BINARY = 'direct', 'text', 'binary'
+# name: (the requests the case exercises, pattern, the number of lines, the
+# maximal size of the leaves buffers (None for not shedding), the way the
+# events are added, the environment of the case, the number of matches and
+# the sum of the events utilities)
+CASES = {
+    'short window': (['user-001'], 'SEQ(61 a, 8 b, 13 c) WHERE b.z > a.z - 30 '
+                     'and c.v < b.v WITHIN 5000000000 picoseconds', 10000,
+                     None, DIRECT, {}, 1185, 190355),
+    'negation': (['user-001'], 'SEQ(61 a, 8! b, 13 c) WHERE c.v > a.v * 1.2 '
+                 'and b.v > 3000000 WITHIN 15000000000 picoseconds', 10000,
+                 None, DIRECT, {}, 1020, 58641),
+    'kleene': (['user-001', 'user-008'], 'SEQ(61 a, 8+ b, 13 c) WHERE '
+               'b.v < c.v WITHIN 1000000000 picoseconds', 10000, None, DIRECT,
+               {}, 110, 469149),
+    'kleene and range': (['user-001', 'user-003', 'user-008'],
+                         'SEQ(61 a, 8+ b, 13 c) WHERE b.v > a.v and '
+                         'c.v > a.v WITHIN 3000000000 picoseconds', 10000,
+                         None, DIRECT, {}, 1910, 418612),
+    'equality': (['user-002'], 'SEQ(61 a, 8 b, 13 c) WHERE b.ay = a.ay and '
+                 'c.v > b.v WITHIN 150000000000 picoseconds', 20000, None,
+                 DIRECT, {}, 213, 71538),
+    'equality and multiplication': (['user-002'], 'SEQ(61 a, 8 b, 13 c) '
+                                    'WHERE b.vz = a.vz and c.v > a.v * 1.2 '
+                                    'WITHIN 15000000000 picoseconds', 10000,
+                                    None, DIRECT, {}, 1, 28009),
+    'long window': (['user-001', 'user-002'], 'SEQ(61 a, 8 b, 13 c) WHERE '
+                    'b.az = a.az and c.v > b.v * 0.5 WITHIN 50000000000 '
+                    'picoseconds', 15000, None, DIRECT, {}, 23, 98895),
+    'equality and band': (['user-002', 'user-004'], EQUALITY_AND_BAND_PATTERN,
+                          20000, None, DIRECT, {}, 7, 11992),
+    'range': (['user-003'], 'SEQ(61 a, 8 b, 13 c) WHERE b.v < a.v + 20000 '
+              'and c.x > b.x * 0.9 WITHIN 15000000000 picoseconds', 10000,
+              None, DIRECT, {}, 25139, 650789),
+    'band': (['user-004'], BAND_PATTERN, 20000, None, DIRECT, {}, 23780,
+             1763094),
+    'columnar': (['user-006'], BAND_PATTERN, 20000, None, DIRECT,
+                 {'STORAGE_MODE': 'columnar'}, 23780, 1763094),
+    'columnar equality': (['user-006'], EQUALITY_AND_BAND_PATTERN, 20000,
+                          None, DIRECT, {'STORAGE_MODE': 'columnar'}, 7,
+                          11992),
+    'shedding': (['user-021', 'user-022'], BAND_PATTERN, 20000, 5, DIRECT, {},
+                 1824, 1763094),
+    'text ingest': (['user-010', 'user-015'], BAND_PATTERN, 20000, 5, TEXT,
+                    {}, 1824, 1763094),
+    'binary ingest': (['user-013', 'user-014', 'user-024'], BAND_PATTERN,
+                      20000, None, BINARY, {}, 23780, 1763094),
+    'binary ingest shedding': (['user-013', 'user-015', 'user-024'],
+                               BAND_PATTERN, 20000, 5, BINARY, {}, 1824,
+                               1763094),
+    # the empirical model was added after the engine started, so its record
+    # is of its own first version
+    'empirical shedding': (['user-025'], BAND_PATTERN, 20000, 5, DIRECT,
+                           {'UTILITY_MODEL': 'empirical'}, 1839, 1783975),
+}
+# the number of events added between the processings when shedding or
+# receiving the events, so the buffers fill up
+BATCH_SIZE = 64
+RESULT = 'result:'
+
+
+def run_case(name: str):
+    """
+    Evaluates the case's pattern over its lines, in the case's environment,
+    and prints the number of matches and the sum of the utilities
+    """
+    from experiments.configurations_map import config
+    from experiments.consts import EVENT_TYPES, PATTERN, ATTRS_DIST_PARAMS, \
+        ATTRS_TYPES, ORIGIN_DATA_DIR, WARM_UP, UTILITY_MODEL, \
+        EMPIRICAL_UTILITY_MODEL, HISTOGRAM_BINS
+    from parsers.parser import Parser
+    from patterns.plans.tree.left_deep_tree_evaluation_plan import \
+        LeftDeepTreeEvaluationPlan
+    from patterns.plans.tree.tree_evaluation_mechanism import \
+        EvaluationMechanism
+    from processor import Processor
+
+    _, _, size, max_size, ingest, _, _, _ = CASES[name]
+    print_ = builtins.print
+    # the evaluation reports its progress
+    builtins.print = lambda *args, **kwargs: None
+    if ingest == DIRECT:
+        parser = Parser(config[EVENT_TYPES])
+        _, pattern = parser.parse_pattern(config[PATTERN], None,
+                                          config[ATTRS_DIST_PARAMS],
+                                          config[ATTRS_TYPES])
+        evaluation_mechanism = EvaluationMechanism(
+            pattern, LeftDeepTreeEvaluationPlan())
+    else:
+        processor = Processor()
+        evaluation_mechanism = processor.evaluation_mechanism
+    # the buffers are not sized by the statistics of the warm up
+    evaluation_mechanism.overload_detector.set_buffers = True
+    if max_size is not None:
+        for leaf in evaluation_mechanism.event_types_to_leaves.values():
+            leaf.update_max_size(max_size)
+    matches, utilities = 0, 0
+    if ingest != DIRECT:
+        # every received event is either shedded or buffered here, by its
+        # utility
+        shed_arriving_event = evaluation_mechanism.shed_arriving_event
+
+        def add_utility(event_type, utility) -> bool:
+            nonlocal utilities
+            utilities += utility
+            return shed_arriving_event(event_type, utility)
+
+        evaluation_mechanism.shed_arriving_event = add_utility
+    batch_size = 1 if max_size is None and ingest == DIRECT else BATCH_SIZE
+    empirical = UTILITY_MODEL == EMPIRICAL_UTILITY_MODEL
+    # the attributes values of the warm up, for the empirical model
+    types_to_values = {}
+    # the lines of the batch, for the processor to receive
+    lines = []
+    with open(f'{ORIGIN_DATA_DIR}/{DATA_FILE}') as f:
+        for i, line in enumerate(f):
+            if i == size:
+                break
+            if ingest != DIRECT:
+                lines.append(line.strip())
+            else:
+                event = parser.parse_event_from_str(line.strip())
+                evaluation_mechanism.add_event(event)
+                utilities += event.utility
+                if empirical and i < WARM_UP:
+                    types_to_values.setdefault(event.type, []).append(
+                        event.values)
+                    if i == WARM_UP - 1:
+                        evaluation_mechanism.set_empirical_utilities(
+                            types_to_values, HISTOGRAM_BINS)
+            if i % batch_size == batch_size - 1:
+                if lines:
+                    receive(processor, lines, ingest)
+                    lines = []
+                matches += process(evaluation_mechanism)
+    if lines:
+        receive(processor, lines, ingest)
+    matches += process(evaluation_mechanism)
+    builtins.print = print_
+    print(f'{RESULT} {matches} {utilities}')
+
+
+def receive(processor, lines, ingest: str):
+    """
+    Has the processor receive the lines as one message of binary records, or
+    as text messages one by one (with no window sizes), and buffer them
+    """
+    from experiments.consts import SEPARATOR
+
+    if ingest == BINARY:
+        processor.add_binary_events(b''.join(
+            processor.binary_parser.encode_event(line, '0') for line in
+            lines))
+    else:
+        for line in lines:
+            processor.add_events_route(f'{line}{SEPARATOR}0')
+    processor.buffer_events()
+
+
+def process(evaluation_mechanism) -> int:
+    """
+    Processes the buffered events, and returns the number of their matches
+    """
+    matches = 0
+    while True:
+        new_matches = evaluation_mechanism.process()
+        if new_matches is None:
+            return matches
+        matches += new_matches
+
+
+def check(names) -> bool:
+    passed = True
+    for name in names:
+        requests, pattern, size, _, _, env, expected_matches, \
+            expected_utilities = CASES[name]
+        output = subprocess.run(
+            [sys.executable, '-m', 'experiments.equivalence_check', '--run',
+             name],
+            env={**os.environ, **ENV, 'PATTERN': pattern,
+                 'DATA_SIZE': str(size), **env},
+            capture_output=True, text=True, check=True).stdout
+        result = [line for line in output.splitlines() if
+                  line.startswith(RESULT)][-1]
+        matches, utilities = result[len(RESULT):].split()
+        matches, utilities = int(matches), float(utilities)
+        if matches == expected_matches and \
+                abs(utilities - expected_utilities) <= \
+                1e-9 * max(1, abs(expected_utilities)):
+            print(f'{name} ({", ".join(requests)}): ok')
+        else:
+            passed = False
+            print(f'{name} ({", ".join(requests)}): {matches} matches and '
+                  f'utilities {utilities}, expected {expected_matches} and '
+                  f'{expected_utilities}')
+    return passed
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--run']:
+        run_case(sys.argv[2])
+    elif not check(sys.argv[1:] or CASES):
+        sys.exit(1)
@@ -0,0 +1,45 @@
+"""
+Measures the ingest and processing throughput of the processor, without the
+network: the events of the data file are handed to the processor by the
+receiving thread's route, as fast as possible, while its processing thread
+evaluates them.
+Run from the engine's directory with the experiment's environment, e.g.:
+    env $(cat env | xargs) DATA_SIZE=20000 python -m experiments.ingest_benchmark
+"""
+import threading
+import time
+
+from experiments.configurations_map import filename
+from experiments.consts import *
+from processor import Processor
+
+
+def run_benchmark():
+    processor = Processor()
+    with open(f'{ORIGIN_DATA_DIR}/{filename}') as f:
+        lines = [line.rstrip('\n') for _, line in zip(range(DATA_SIZE), f)]
+    # the data file may have fewer lines than DATA_SIZE
+    processor.num_events = len(lines)
+    processing = threading.Thread(target=processor.process_events,
+                                  args=([], {}))
+    processing.start()
+    # the processing thread waits before starting to process, like it waits
+    # for the generator
+    time.sleep(5)
+    start = time.time()
+    for line in lines:
+        processor.add_events_route(f'{line}{SEPARATOR}0')
+    ingest_end = time.time()
+    # the processing thread stops when it drains the closed queue
+    processor.ingest_queue.close()
+    processing.join()
+    end = time.time()
+    print(f'events: {len(lines)}, matches: {processor.matches}, '
+          f'shedded: {processor.new_shedded + processor.buffer_shedded}')
+    print(f'ingest throughput: {len(lines) / (ingest_end - start):.0f} '
+          f'events/s')
+    print(f'total throughput: {len(lines) / (end - start):.0f} events/s')
+
+
+if __name__ == '__main__':
+    run_benchmark()
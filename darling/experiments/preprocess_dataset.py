@@ -0,0 +1,121 @@
+"""
+Prepares the data files of patterns from a full dataset file, which may be
+gzipped (e.g. full-game.gz of the soccer dataset): the lines of the event
+types of every pattern are written to its own data file (named like its
+data distributions, e.g. soccer_13_61_8.txt), and the columnar cache of
+every data file is built (see parsers/columnar_cache.py).
+The dataset is streamed in chunks, which are filtered and converted by a
+pool of processes.
+Run from the engine's directory with the experiment's environment, e.g.:
+    env $(cat env | xargs) python -m experiments.preprocess_dataset \
+        full-game.gz 'SEQ(61 a, 8 b, 13 c) WHERE ... WITHIN ...' ...
+(without patterns, the PATTERN of the environment is used). Then run the
+experiment with DATA_FILE set to the printed data file.
+"""
+import collections
+import gzip
+import multiprocessing
+import os
+import sys
+import time
+import typing
+
+from experiments.configurations_map import data_to_col_names, \
+    data_to_col_types
+from experiments.consts import *
+from parsers.columnar_cache import ColumnarCache
+from parsers.parser import Parser
+
+# the number of bytes of the dataset handed to a process at once
+BYTES_CHUNK_SIZE = 2 ** 24
+NUM_WORKERS = int(os.getenv('NUM_WORKERS', str(os.cpu_count())))
+
+
+def read_chunks(dataset_file: str) -> typing.Iterator[bytes]:
+    """
+    Streams the (decompressed) dataset in chunks of whole lines
+    """
+    open_ = gzip.open if dataset_file.endswith('.gz') else open
+    with open_(dataset_file, 'rb') as f:
+        rest = b''
+        while True:
+            block = f.read(BYTES_CHUNK_SIZE)
+            if not block:
+                break
+            end = block.rfind(b'\n') + 1
+            if not end:
+                rest += block
+                continue
+            yield rest + block[:end]
+            rest = block[end:]
+        if rest:
+            yield rest + b'\n'
+
+
+def filter_chunk(chunk: bytes, types_sets: typing.List[typing.Set[bytes]]) \
+        -> typing.List[bytes]:
+    """
+    Returns the lines of the chunk of every set of event types
+    """
+    filtered = [[] for _ in types_sets]
+    for line in chunk.split(b'\n')[:-1]:
+        type_name = line.split(b',', 1)[0].strip()
+        for lines, types in zip(filtered, types_sets):
+            if type_name in types:
+                lines.append(line)
+    return [b''.join([line + b'\n' for line in lines]) for lines in filtered]
+
+
+def filter_dataset(dataset_file: str, data_files: typing.List[str],
+                   types_sets: typing.List[typing.Set[bytes]],
+                   pool: multiprocessing.pool.Pool):
+    """
+    Writes the lines of every set of event types to its data file, by their
+    order in the dataset. The chunks are filtered by the pool, and only a few
+    of them are in flight at once, so the dataset is never held in memory
+    """
+    outputs = [open(data_file, 'wb') for data_file in data_files]
+    pending = collections.deque()
+    try:
+        for chunk in read_chunks(dataset_file):
+            pending.append(pool.apply_async(filter_chunk, (chunk, types_sets)))
+            while len(pending) > 2 * NUM_WORKERS or (pending and
+                                                     pending[0].ready()):
+                for output, lines in zip(outputs, pending.popleft().get()):
+                    output.write(lines)
+        while pending:
+            for output, lines in zip(outputs, pending.popleft().get()):
+                output.write(lines)
+    finally:
+        for output in outputs:
+            output.close()
+
+
+def preprocess(dataset_file: str, patterns: typing.List[str]):
+    data_files, types_sets = [], []
+    for pattern in patterns:
+        data_files.append(f'{ORIGIN_DATA_DIR}/'
+                          f'{Parser.get_dist_filename(DATASET_KIND, pattern)}')
+        types_sets.append({type_name.encode() for type_name in
+                           Parser.get_data_filename(DATASET_KIND,
+                                                    pattern)[1]})
+    with multiprocessing.Pool(NUM_WORKERS) as pool:
+        start = time.time()
+        filter_dataset(dataset_file, data_files, types_sets, pool)
+        print(f'filtered {dataset_file} in {time.time() - start:.1f}s')
+        for data_file in data_files:
+            if not os.path.getsize(data_file):
+                print(f'{data_file} has no events')
+                continue
+            start = time.time()
+            cache = ColumnarCache.build(data_file,
+                                        data_to_col_names.get(DATASET_KIND),
+                                        data_to_col_types.get(DATASET_KIND),
+                                        WITH_WS, pool)
+            print(f'DATA_FILE={os.path.basename(data_file)}: '
+                  f'{cache.size} events, cached in '
+                  f'{time.time() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    preprocess(sys.argv[1], sys.argv[2:] or [os.environ.get('PATTERN')])
@@ -1,18 +1,18 @@
-MAX_LOAD = 'max_load'
-TIME = 'time'
-MATCHES = 'matches'
-NUM_SHEDDED = 'num_shedded'
-NEW_SHEDDED = 'new_shedded'
-BUFFER_SHEDDED = 'buffer_shedded'
-NUM_REMOVED = 'num_removed'
-NOT_RELATED = 'not_related'
-NUM_OVERLOAD = 'num_overload'
-THROUGHPUT = 'throughput'
-G_MAX_RATE = 'G_max_rate'
-M_MAX_RATE = 'M_max_rate'
-A_MAX_RATE = 'A_max_rate'
-SEQ_LEN = 'seq_len'
-COND_LEN = 'cond_len'
-TOTAL_MATCHES = 'total_matches'
-UTILITY_LOSS = 'utility_loss'
-TREE_LOAD = 'tree_load'
+MAX_LOAD = 'max_load'
+TIME = 'time'
+MATCHES = 'matches'
+NUM_SHEDDED = 'num_shedded'
+NEW_SHEDDED = 'new_shedded'
+BUFFER_SHEDDED = 'buffer_shedded'
+NUM_REMOVED = 'num_removed'
+NOT_RELATED = 'not_related'
+NUM_OVERLOAD = 'num_overload'
+THROUGHPUT = 'throughput'
+G_MAX_RATE = 'G_max_rate'
+M_MAX_RATE = 'M_max_rate'
+A_MAX_RATE = 'A_max_rate'
+SEQ_LEN = 'seq_len'
+COND_LEN = 'cond_len'
+TOTAL_MATCHES = 'total_matches'
+UTILITY_LOSS = 'utility_loss'
+TREE_LOAD = 'tree_load'
@@ -1,130 +1,250 @@
-import socket
-import time
-from pathlib import Path
-
-import requests
-
-from experiments.configurations_map import config
-from experiments.consts import *
-from parsers.parser import Parser
-
-
-class EventsGenerator:
-    def __init__(self):
-        self.boost = self.get_boost(config[BOOST])
-        self.random_indexes = list(self.boost.keys())
-        self.session = requests.Session()
-        self.sleep_reg = float(os.getenv('SLEEP_REG'))
-        self.sleep_load = float(os.getenv('SLEEP_LOAD'))
-        self.config = config
-        self.parser = Parser(self.config[EVENT_TYPES])
-        self.types, self.pattern = self.parser.parse_pattern(self.config[PATTERN],
-                                                             self.config.get(SELECTIVITY),
-                                                             self.config[
-                                                                 ATTRS_DIST_PARAMS], config[ATTRS_TYPES])
-        filename, self.types_names = Parser.get_data_filename(DATASET_KIND,
-                                                              config[PATTERN])
-        print(self.types_names)
-        self.file = f'{ORIGIN_DATA_DIR}/{filename}'
-
-    def get_boost(self, boost_percents):
-        """
-        Creates boost in indexes from boost given in percents
-        """
-        new_boost = {}
-        for (index, val) in boost_percents.items():
-            new_index = int(DATA_SIZE * index / 100)
-            new_val = int(DATA_SIZE * val / 100)
-            new_boost[new_index] = new_val
-        print(f'boost:\n{new_boost}')
-        return new_boost
-
-    def check_warm_up_state(self, client_socket) -> bool:
-        client_socket.send(CHECK_FINISHED_WARM_UP.encode())
-        ack = client_socket.recv(1024).decode()
-        if ack == FINISHED_WARM_UP:
-            return True
-        elif ack == NOT_FINISHED_WARM_UP:
-            return False
-        else:
-            print(f'wrong return value for check finished warm up! {ack}')
-            return False
-
-    def send_events(self, time_diffs_file: str = None):
-        client_socket = socket.socket()  # instantiate
-        client_socket.connect((IP, PORT))  # connect to the server
-        x = client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-        sleep = False
-        finished_warm_up = False
-        boost_count = None
-        print(f'warm up size: {WARM_UP}')
-        time_diffs = []
-        if time_diffs_file is not None:
-            with open(time_diffs_file, 'r') as t:
-                for l in t:
-                    time_diffs.append(float(l.rstrip()))
-        try:
-            with open(self.file, 'r') as f:
-                for i, line in enumerate(f):
-                    if i == DATA_SIZE:
-                        break
-                    if i % 1000 == 0:
-                        print(f'added {i} events')
-                    if line.split(',')[0] not in self.types_names:
-                        continue
-                    if i == WARM_UP:
-                        sleep = True
-                        while not finished_warm_up:
-                            finished_warm_up = self.check_warm_up_state(
-                                client_socket)
-                            if not finished_warm_up:
-                                time.sleep(SLEEP_WARM_UP_SEC)
-                    if sleep:
-                        time_sleep = 0 if time_diffs_file is None else \
-                            time_diffs[i]
-                        if i in self.random_indexes:
-                            boost_count = self.boost[i]
-                            self.random_indexes.remove(i)
-                        if not boost_count:
-                            time.sleep(self.sleep_reg + time_sleep)
-                        else:
-                            time.sleep(self.sleep_load + time_sleep)
-                            boost_count -= 1
-                    line = line.strip('\n')
-                    splitted_line = line.split(',')
-                    if os.environ.get('WS', None) is not None:
-                        event, ws = ','.join(splitted_line[:-1]), splitted_line[
-                            -1]
-                    else:
-                        event, ws = ','.join(splitted_line), '0'
-                    payload = f'{event}{SEPARATOR}{ws}'.encode()
-                    sent = False
-                    while not sent:
-                        try:
-                            client_socket.send(payload)
-                            ack = client_socket.recv(1024).decode()
-                            if ack == GOT_MESSAGE:
-                                sent = True
-                        except socket.error:
-                            # set connection status and recreate socket
-                            connected = False
-                            clientSocket = socket.socket()
-                            print("connection lost... reconnecting")
-                            while not connected:
-                                # attempt to reconnect, otherwise sleep for 2 seconds
-                                try:
-                                    clientSocket.connect((IP, PORT))
-                                    connected = True
-                                    print("re-connection successful")
-                                except socket.error:
-                                    sleep(2)
-
-            client_socket.send(FINISH.encode())
-        finally:
-            client_socket.close()
-
-
-if __name__ == '__main__':
-    time.sleep(5)  # sleeping until the server up
-    time_diffs_file = os.environ.get('ARRIVAL_RATES', None)
-    EventsGenerator().send_events(time_diffs_file)
+import json
+import socket
+import time
+import typing
+from pathlib import Path
+
+import requests
+
+from experiments.configurations_map import config
+from experiments.consts import *
+from load_profile import ConstantProfile, LoadProfile, PeaksProfile, \
+    SumProfile, TraceProfile, get_boost, get_send_times, parse_load_profile
+from parsers.binary_parser import BinaryParser
+from parsers.columnar_cache import ColumnarCache
+from parsers.parser import Parser
+from protocol import *
+from replay_scheduler import ReplayScheduler
+
+
+class EventsGenerator:
+    def __init__(self):
+        self.boost = self.get_boost(config[BOOST])
+        self.session = requests.Session()
+        self.sleep_reg = 1 / TARGET_RATE if TARGET_RATE else \
+            float(os.getenv('SLEEP_REG'))
+        self.sleep_load = float(os.getenv('SLEEP_LOAD'))
+        self.config = config
+        self.parser = Parser(self.config[EVENT_TYPES])
+        self.types, self.pattern = self.parser.parse_pattern(self.config[PATTERN],
+                                                             self.config.get(SELECTIVITY),
+                                                             self.config[
+                                                                 ATTRS_DIST_PARAMS], config[ATTRS_TYPES])
+        filename, self.types_names = Parser.get_data_filename(DATASET_KIND,
+                                                              config[PATTERN])
+        # with several generators, each of them sends the events of its share
+        # of the event types
+        self.types_names = self.types_names[SOURCE_ID::NUM_SOURCES]
+        print(self.types_names)
+        self.binary_parser = BinaryParser(self.types) if \
+            EVENTS_ENCODING == 'binary' else None
+        # the position of the time among the fields of a line (after the
+        # type), if it is an attribute of the events (all the event types of
+        # a dataset have the same attributes)
+        event_type = next(iter(self.types.values()))
+        self.time_field = event_type.time_index + 1 if \
+            event_type.time_index < len(event_type.attrs_names) else None
+        self.file = f'{ORIGIN_DATA_DIR}/{filename}'
+        self.cache = ColumnarCache.load(self.file, event_type.attrs_names,
+                                        event_type.attrs_types, WITH_WS)
+
+    def get_boost(self, boost_percents):
+        """
+        Creates boost in indexes from boost given in percents
+        """
+        new_boost = get_boost(boost_percents, DATA_SIZE)
+        print(f'boost:\n{new_boost}')
+        return new_boost
+
+    def get_load_profile(self, time_diffs_file: str = None) -> LoadProfile:
+        """
+        Returns the load profile declared in the LOAD_PROFILE file, or else the
+        profile of sleeping SLEEP_LOAD in the BOOST peaks and SLEEP_REG (or by
+        TARGET_RATE) otherwise, plus the ARRIVAL_RATES gaps
+        """
+        if LOAD_PROFILE is not None:
+            with open(LOAD_PROFILE) as f:
+                return parse_load_profile(json.load(f))
+        profile = PeaksProfile(ConstantProfile(self.sleep_reg),
+                               ConstantProfile(self.sleep_load),
+                               self.config[BOOST])
+        if time_diffs_file is not None:
+            profile = SumProfile([profile, TraceProfile(time_diffs_file)])
+        return profile
+
+    def receive_frame(self, frame_type: int) -> bytes:
+        """
+        Reads frames from the processor until a frame of the given type, and
+        returns its payload. The credits received meanwhile are accumulated
+        """
+        while True:
+            received_type, payload = self.reader.read_frame()
+            if received_type == CREDIT_FRAME:
+                self.credit += decode_credit(payload)
+            if received_type == frame_type:
+                return payload
+
+    def send_batch(self, client_socket, batch: typing.List[str]):
+        """
+        Sends the batched events, in frames of at most the available credit
+        (waiting for credit from the processor), and empties the batch
+        """
+        while batch:
+            while not self.credit:
+                self.receive_frame(CREDIT_FRAME)
+            size = min(self.credit, len(batch))
+            if self.binary_parser is not None:
+                send_binary_events(client_socket, batch[:size])
+            else:
+                send_events(client_socket, batch[:size])
+            self.credit -= size
+            del batch[:size]
+
+    def send_watermark(self, client_socket, timestamp):
+        """
+        Tells the processor that the next events of this generator are not
+        earlier than the given timestamp, so it may process the earlier
+        events of the other generators meanwhile (see Processor.watermark)
+        """
+        if NUM_SOURCES > 1 and timestamp is not None:
+            send_watermark(client_socket, timestamp)
+
+    def check_warm_up_state(self, client_socket) -> bool:
+        send_control(client_socket, CHECK_FINISHED_WARM_UP)
+        ack = decode_control(self.receive_frame(CONTROL_FRAME))
+        if ack == FINISHED_WARM_UP:
+            return True
+        elif ack == NOT_FINISHED_WARM_UP:
+            return False
+        else:
+            print(f'wrong return value for check finished warm up! {ack}')
+            return False
+
+    def count_events(self) -> typing.Tuple[int, int]:
+        """
+        Returns the number of the events of the generator's types among the
+        first DATA_SIZE lines of the dataset, and the number of them before
+        the WARM_UP line, so the load profile is of the events the generator
+        sends
+        """
+        if self.cache is not None:
+            rows = self.cache.get_rows(self.types_names, DATA_SIZE)
+            return len(rows), int(rows.searchsorted(WARM_UP))
+        size, warm_up_size = 0, 0
+        with open(self.file, 'r') as f:
+            for i, line in enumerate(f):
+                if i == DATA_SIZE:
+                    break
+                if line.split(',', 1)[0] in self.types_names:
+                    size += 1
+                    warm_up_size += i < WARM_UP
+        return size, warm_up_size
+
+    def read_events(self) -> \
+            typing.Iterator[typing.Tuple[int, typing.Any, typing.Any]]:
+        """
+        Yields the events of the generator's types among the first DATA_SIZE
+        lines of the dataset, with their line numbers and timestamps (None if
+        the time is not an attribute), encoded for sending.
+        The events are read from the columnar cache of the dataset if it was
+        built (see experiments/build_columnar_cache.py), and from the dataset
+        file otherwise
+        """
+        time_field, cache = self.time_field, self.cache
+        if cache is not None:
+            rows = cache.get_rows(self.types_names, DATA_SIZE)
+            print(f'reading {len(rows)} events from the columnar cache')
+            if self.binary_parser is not None:
+                # the records are packed from the typed columns
+                for i, type_name, values, ws in cache.iter_values(rows):
+                    timestamp = values[time_field - 1] if time_field else None
+                    yield i, timestamp, self.binary_parser.encode_values(
+                        type_name, values, ws)
+            else:
+                # the lines are sliced from the dataset file as they are
+                for i, line in cache.iter_lines(rows):
+                    event, ws = line.rsplit(',', 1) if cache.ws is not None \
+                        else (line, '0')
+                    timestamp = event.split(',')[time_field] if time_field \
+                        else None
+                    yield i, timestamp, f'{event}{SEPARATOR}{ws}'
+            return
+        with open(self.file, 'r') as f:
+            for i, line in enumerate(f):
+                if i == DATA_SIZE:
+                    break
+                if i % 1000 == 0:
+                    print(f'added {i} events')
+                if line.split(',')[0] not in self.types_names:
+                    continue
+                line = line.strip('\n')
+                splitted_line = line.split(',')
+                if WITH_WS:
+                    event, ws = ','.join(splitted_line[:-1]), splitted_line[
+                        -1]
+                else:
+                    event, ws = ','.join(splitted_line), '0'
+                timestamp = splitted_line[time_field] if time_field else None
+                if self.binary_parser is not None:
+                    yield i, timestamp, self.binary_parser.encode_event(event,
+                                                                        ws)
+                else:
+                    yield i, timestamp, f'{event}{SEPARATOR}{ws}'
+
+    def send_events(self, time_diffs_file: str = None):
+        client_socket = socket.socket()  # instantiate
+        client_socket.connect((IP, PORT))  # connect to the server
+        x = client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.reader = FrameReader(client_socket)
+        # the number of events the processor lets us send
+        self.credit = 0
+        batch = []
+        # the send times of the generator's events after the warm up are
+        # precomputed, by the number of the events it sends (not of the
+        # lines), so every generator follows the load profile on its own
+        size, warm_up_size = self.count_events()
+        send_times = get_send_times(
+            self.get_load_profile(time_diffs_file), size, warm_up_size)
+        scheduler = ReplayScheduler(send_times, REPLAY_SPIN_SEC)
+        sleep = False
+        finished_warm_up = False
+        print(f'warm up size: {WARM_UP}')
+        try:
+            for n, (i, timestamp, event) in enumerate(self.read_events()):
+                if i >= WARM_UP and not sleep:
+                    # the lines are counted over all the generators, so
+                    # the warm up ends by the same line for each of them
+                    self.send_batch(client_socket, batch)
+                    self.send_watermark(client_socket, timestamp)
+                    sleep = True
+                    while not finished_warm_up:
+                        finished_warm_up = self.check_warm_up_state(
+                            client_socket)
+                        if not finished_warm_up:
+                            time.sleep(SLEEP_WARM_UP_SEC)
+                    # the events after the warm up are paced from now on
+                    scheduler.start()
+                if sleep and not scheduler.is_due(n - warm_up_size):
+                    # the due events are sent before waiting, so no
+                    # event is delayed by the batching
+                    self.send_batch(client_socket, batch)
+                    self.send_watermark(client_socket, timestamp)
+                    scheduler.wait()
+                batch.append(event)
+                if len(batch) == EVENTS_BATCH_SIZE:
+                    self.send_batch(client_socket, batch)
+
+            self.send_batch(client_socket, batch)
+            send_control(client_socket, FINISH)
+            # waiting for the processor to close the connection, so no frame
+            # is dropped by closing it while the processor still sends credit
+            while self.reader.read_frame() is not None:
+                continue
+        finally:
+            client_socket.close()
+
+
+if __name__ == '__main__':
+    time.sleep(5)  # sleeping until the server up
+    time_diffs_file = os.environ.get('ARRIVAL_RATES', None)
+    EventsGenerator().send_events(time_diffs_file)
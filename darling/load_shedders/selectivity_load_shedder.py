@@ -1,32 +1,32 @@
-from load_shedders.load_shedder import LoadShedder
-from objects.event import Event
-from patterns.plans.tree.node.leaf_node import LeafNode
-import typing
-
-
-class SelectivityLoadShedder(LoadShedder):
-    def __init__(self):
-        self.utility_functions = {}
-
-    def shed(self, event: Event, leaf_node: LeafNode, mechanism:
-                'EvaluationMechanism') -> bool:
-
-        event_utility = event.utility
-        buffer_event = leaf_node.event_buffer.show_sorted_next_event()
-        buffer_utility = buffer_event.utility if buffer_event else None
-
-        if not buffer_event:
-            print('Error!!!!!! enterd load shedder but buffer empty!!!')
-
-        if buffer_event and event < buffer_event:
-            # removing the new event
-            return True
-        # remove the buffer event
-        buffer_event_removed = leaf_node.event_buffer.get_next_event(True)
-        if buffer_event != buffer_event_removed:
-            print('Error!!! buffer event differs from removed event when '
-                  'should be equal')
-        success = leaf_node.add_event(event, True)
-        if not success:
-            print(f'something wrong in code!!!!')
-        return False
+from load_shedders.load_shedder import LoadShedder
+from objects.event import Event
+from patterns.plans.tree.node.leaf_node import LeafNode
+import typing
+
+
+class SelectivityLoadShedder(LoadShedder):
+    def __init__(self):
+        self.utility_functions = {}
+
+    def shed(self, event: Event, leaf_node: LeafNode, mechanism:
+                'EvaluationMechanism') -> bool:
+
+        event_utility = event.utility
+        buffer_event = leaf_node.event_buffer.show_sorted_next_event()
+        buffer_utility = buffer_event.utility if buffer_event else None
+
+        if not buffer_event:
+            print('Error!!!!!! enterd load shedder but buffer empty!!!')
+
+        if buffer_event and event < buffer_event:
+            # removing the new event
+            return True
+        # remove the buffer event
+        buffer_event_removed = leaf_node.event_buffer.get_next_event(True)
+        if buffer_event != buffer_event_removed:
+            print('Error!!! buffer event differs from removed event when '
+                  'should be equal')
+        success = leaf_node.add_event(event, True)
+        if not success:
+            print(f'something wrong in code!!!!')
+        return False
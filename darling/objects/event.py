@@ -1,54 +1,77 @@
-import typing
-import sys
-from objects.exceptions import InvalidAttribute
-from patterns.consts import *
-from datetime import datetime
-
-
-class Event:
-    def __init__(self, event_type: 'EventType', attrs_values: typing.List,
-                 name=None):
-        self.type = event_type
-        self.name = next(self.type.event_name_generator) if name is None else\
-            name
-        if not self.type.is_valid_attrs(attrs_values):
-            raise InvalidAttribute()
-        attrs_values = [t(i) if i else 0.0 for i, t in zip(attrs_values,
-                                                           self.type.attrs_types)]
-        self.attrs = dict(zip(self.type.attrs_names, attrs_values))
-        if TIME_KEY not in self.type.attrs_names:
-            self.attrs[TIME_KEY] = datetime.utcnow().timestamp()
-        self.utility = None
-        self.deleted = False
-
-    def __str__(self):
-        attrs = ','.join([f'{key}={val}' for key, val in self.attrs.items()])
-        return f'{self.name}({attrs})'
-
-    def get_timestamp(self):
-        return self.attrs[TIME_KEY]
-
-    def size(self):
-        return sys.getsizeof(self.attrs)
-
-    def __lt__(self, other):
-        if self.utility == other.utility:
-            return self.get_timestamp() >= other.get_timestamp() if \
-                self.type.start_seq else self.get_timestamp() < \
-                                         other.get_timestamp()
-
-        return self.utility < other.utility
-
-    def to_json(self) -> typing.Dict:
-        return {
-            'type': self.type.name,
-            'attrs_values': list(self.attrs.values()),
-            'name': self.name
-        }
-
-    @staticmethod
-    def from_json(event_json, event_type: 'EventType') -> 'Event':
-        attrs_values = event_json.get('attrs_values')
-        name = event_json.get('name')
-        return Event(event_type, attrs_values, name)
-
+import typing
+from objects.exceptions import InvalidAttribute
+from patterns.consts import *
+from datetime import datetime
+
+
+class Event:
+    # the events are the most common objects in the system (in the leaves
+    # buffers and in all the partial matches), so they are kept compact
+    __slots__ = ['type', 'values', 'num', '_name', 'utility', 'deleted',
+                 'system_ts_in_adding', 'seq']
+
+    def __init__(self, event_type: 'EventType', attrs_values: typing.List,
+                 name=None, converted: bool = False):
+        self.type = event_type
+        # only the unnamed events are numbered, for naming them on demand
+        self.num = next(self.type.events_counter) if name is None else None
+        self._name = name
+        if not self.type.is_valid_attrs(attrs_values):
+            raise InvalidAttribute()
+        # the attributes values by the positions of event_type.attrs_names.
+        # converted values (e.g. decoded from binary) are already typed
+        values = attrs_values if converted else \
+            self.type.decode_attrs(attrs_values)
+        if self.type.time_index == len(values):
+            values = list(values) + [datetime.utcnow().timestamp()]
+        self.values = tuple(values)
+        self.utility = None
+        self.deleted = False
+        self.system_ts_in_adding = None
+        # the arrival order of the event in the system
+        self.seq = None
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            self._name = self.type.gen_event_name(self.num)
+        return self._name
+
+    @property
+    def attrs(self) -> typing.Dict:
+        return {attr_name: self.values[i] for attr_name, i in
+                self.type.attrs_indexes.items()}
+
+    def get_attr(self, attr_name: str):
+        return self.values[self.type.attrs_indexes[attr_name]]
+
+    def __str__(self):
+        attrs = ','.join([f'{key}={val}' for key, val in self.attrs.items()])
+        return f'{self.name}({attrs})'
+
+    def get_timestamp(self):
+        return self.values[self.type.time_index]
+
+    def size(self):
+        return self.type.event_size
+
+    def __lt__(self, other):
+        if self.utility == other.utility:
+            return self.get_timestamp() >= other.get_timestamp() if \
+                self.type.start_seq else self.get_timestamp() < \
+                                         other.get_timestamp()
+
+        return self.utility < other.utility
+
+    def to_json(self) -> typing.Dict:
+        return {
+            'type': self.type.name,
+            'attrs_values': list(self.attrs.values()),
+            'name': self.name
+        }
+
+    @staticmethod
+    def from_json(event_json, event_type: 'EventType') -> 'Event':
+        attrs_values = event_json.get('attrs_values')
+        name = event_json.get('name')
+        return Event(event_type, attrs_values, name)
@@ -1,29 +1,69 @@
-import typing
-
-
-class EventType:
-    def __init__(self, name: str, attrs_names: typing.List[str],
-                 attrs_dist_params: typing.Dict[str, typing.List[float]],
-                 attrs_types: typing.Dict):
-        self.name = name
-        self.attrs_names = attrs_names
-        self.attrs_types = attrs_types
-        self.attrs_sum = [0] * (len(attrs_names) - 1) # without time
-        self.curr_num = 0
-        self.event_name_generator = self.gen_event_name()
-        self.size = len(self.attrs_names)
-        self.attrs_dist_params = attrs_dist_params
-        self.kleene = False
-        self.neg = False
-
-    def is_valid_attrs(self, attrs: typing.List[str]) -> int:
-        return len(self.attrs_names) == len(attrs)
-
-    def gen_event_name(self) -> str:
-        i = 1
-        while True:
-            yield f'{self.name}_{i}'
-            i += 1
-
-    def __str__(self):
-        return f'{self.name}{self.attrs_names}'
+import itertools
+import sys
+import typing
+
+from patterns.consts import TIME_KEY
+
+
+class EventType:
+    def __init__(self, name: str, attrs_names: typing.List[str],
+                 attrs_dist_params: typing.Dict[str, typing.List[float]],
+                 attrs_types: typing.Dict):
+        self.name = name
+        self.attrs_names = attrs_names
+        self.attrs_types = attrs_types
+        self.attrs_sum = [0] * (len(attrs_names) - 1) # without time
+        self.curr_num = 0
+        # the events are numbered, and their names are generated only on demand
+        self.events_counter = itertools.count(1)
+        self.size = len(self.attrs_names)
+        # the events hold their attributes by position, so the conditions
+        # access them by the precomputed index of the attribute
+        self.attrs_indexes = {attr_name: i for i, attr_name in
+                              enumerate(self.attrs_names)}
+        if TIME_KEY not in self.attrs_indexes:
+            # the time is added by the event itself after the attributes
+            self.attrs_indexes[TIME_KEY] = len(self.attrs_names)
+        self.time_index = self.attrs_indexes[TIME_KEY]
+        self.attrs_dist_params = attrs_dist_params
+        self.kleene = False
+        self.neg = False
+        # the (index, type) of the attributes converted when parsing an event
+        self.decoded_attrs = list(enumerate(self.attrs_types))
+        # the reported size of an event, which is the size its attributes
+        # dict used to have (with the time), so the storage sizes of the
+        # results stay comparable. it depends only on the number of keys
+        attrs = dict(zip(self.attrs_names, [0] * len(self.attrs_names)))
+        attrs[TIME_KEY] = 0
+        self.event_size = sys.getsizeof(attrs)
+
+    def set_used_attrs(self, used_attrs: typing.Set[str]):
+        """
+        Projects the parsing of the events of this type to the given
+        attributes and the time. The other attributes are not converted, and
+        their values in the events are None.
+        """
+        used_attrs = set(used_attrs) | {TIME_KEY}
+        self.decoded_attrs = [(i, attr_type) for i, (attr_name, attr_type) in
+                              enumerate(zip(self.attrs_names,
+                                            self.attrs_types))
+                              if attr_name in used_attrs]
+
+    def decode_attrs(self, attrs_values: typing.List[str]) -> typing.List:
+        values = [None] * self.size
+        for i, attr_type in self.decoded_attrs:
+            value = attrs_values[i]
+            values[i] = attr_type(value) if value else 0.0
+        return values
+
+    def is_valid_attrs(self, attrs: typing.List[str]) -> int:
+        return len(self.attrs_names) == len(attrs)
+
+    def get_attr_index(self, attr_name: str) -> int:
+        return self.attrs_indexes[attr_name]
+
+    def gen_event_name(self, num: int) -> str:
+        return f'{self.name}_{num}'
+
+    def __str__(self):
+        return f'{self.name}{self.attrs_names}'
@@ -0,0 +1,116 @@
+import threading
+import time
+import typing
+
+
+class Waiter:
+    """
+    This class lets one side of a SPSCQueue wait for the other side.
+    The waiting side first spins (yielding the CPU) and only then blocks.
+    The number of spins adapts to the recent waits: it grows when spinning was
+    enough, and shrinks when the side had to block anyway.
+    """
+    MIN_SPINS = 1
+    MAX_SPINS = 256
+
+    def __init__(self):
+        self.spins = self.MAX_SPINS
+        self.blocked = False
+        self._event = threading.Event()
+
+    def wait(self, ready: typing.Callable[[], bool]):
+        for _ in range(self.spins):
+            if ready():
+                self.spins = min(2 * self.spins, self.MAX_SPINS)
+                return
+            time.sleep(0)
+        self.spins = max(self.spins // 2, self.MIN_SPINS)
+        self._event.clear()
+        self.blocked = True
+        # the other side wakes us only if it sees us blocked, so the condition
+        # is checked again after marking it
+        while not ready():
+            self._event.wait()
+            self._event.clear()
+        self.blocked = False
+
+    def wake(self):
+        if self.blocked:
+            self._event.set()
+
+
+class SPSCQueue:
+    """
+    A bounded queue between a single producer thread and a single consumer
+    thread, over a ring buffer.
+    Only the producer advances the tail and only the consumer advances the
+    head, so putting and draining take no lock. The consumer drains all the
+    available items at once.
+    """
+    def __init__(self, capacity: int = 2 ** 16):
+        # the capacity is rounded up to a power of 2, so the ring positions
+        # are computed by masking
+        self.capacity = 1 << (capacity - 1).bit_length()
+        self.mask = self.capacity - 1
+        self.slots = [None] * self.capacity
+        self.head = 0
+        self.tail = 0
+        self.closed = False
+        self.producer = Waiter()
+        self.consumer = Waiter()
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def get_room(self) -> int:
+        """
+        Returns the number of items the producer may put without waiting
+        """
+        return self.capacity - (self.tail - self.head)
+
+    def _is_full(self) -> bool:
+        return self.tail - self.head == self.capacity
+
+    def _is_ready(self) -> bool:
+        return self.tail != self.head or self.closed
+
+    def put(self, item):
+        if self._is_full():
+            self.producer.wait(lambda: not self._is_full())
+        self.slots[self.tail & self.mask] = item
+        self.tail += 1
+        self.consumer.wake()
+
+    def close(self):
+        """
+        Marks that the producer will not put more items
+        """
+        self.closed = True
+        self.consumer.wake()
+
+    def drain(self) -> typing.List:
+        """
+        Removes and returns all the available items, without blocking
+        """
+        head, tail = self.head, self.tail
+        if head == tail:
+            return []
+        start, end = head & self.mask, tail & self.mask
+        if start < end:
+            items = self.slots[start:end]
+            self.slots[start:end] = [None] * (end - start)
+        else:
+            # the items wrap around the end of the ring
+            items = self.slots[start:] + self.slots[:end]
+            self.slots[start:] = [None] * (self.capacity - start)
+            self.slots[:end] = [None] * end
+        self.head = tail
+        self.producer.wake()
+        return items
+
+    def wait(self):
+        """
+        Blocks until there are available items or the queue is closed
+        """
+        if not self._is_ready():
+            self.consumer.wait(self._is_ready)
@@ -0,0 +1,63 @@
+import collections
+import typing
+
+from objects.event import Event
+
+
+class UtilityBucketQueue:
+    """
+    This class keeps the events of a leaf buffer by their utility (0..psi):
+    every utility has a bucket of its events by their arrival order, and a
+    bitmap of the non-empty buckets gives the minimal utility at once (its
+    lowest set bit), so finding, peeking and removing an event of the minimal
+    utility, and removing the oldest event of a utility, take O(1).
+    """
+    def __init__(self, psi: int):
+        self.buckets = [collections.deque() for _ in range(psi + 1)]
+        # the i-th bit is set iff the bucket of utility i is not empty
+        self.bitmap = 0
+
+    def __bool__(self):
+        return self.bitmap != 0
+
+    def append(self, event: Event):
+        self.buckets[event.utility].append(event)
+        self.bitmap |= 1 << event.utility
+
+    def get_min_utility(self) -> typing.Optional[int]:
+        if not self.bitmap:
+            return None
+        return (self.bitmap & -self.bitmap).bit_length() - 1
+
+    def show_min(self, oldest: bool) -> typing.Optional[Event]:
+        """
+        Returns the oldest (or the newest) event of the minimal utility
+        """
+        utility = self.get_min_utility()
+        if utility is None:
+            return None
+        return self.buckets[utility][0 if oldest else -1]
+
+    def pop_min(self, oldest: bool) -> typing.Optional[Event]:
+        """
+        Removes and returns the oldest (or the newest) event of the minimal
+        utility
+        """
+        utility = self.get_min_utility()
+        if utility is None:
+            return None
+        bucket = self.buckets[utility]
+        event = bucket.popleft() if oldest else bucket.pop()
+        if not bucket:
+            self.bitmap &= ~(1 << utility)
+        return event
+
+    def pop_oldest(self, utility: int) -> Event:
+        """
+        Removes and returns the oldest event of the given utility
+        """
+        bucket = self.buckets[utility]
+        event = bucket.popleft()
+        if not bucket:
+            self.bitmap &= ~(1 << utility)
+        return event
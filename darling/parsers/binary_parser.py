@@ -0,0 +1,75 @@
+import struct
+import typing
+
+import numpy as np
+
+from objects.event_type import EventType
+
+# the formats of the attributes in a binary record, by their types
+ATTRS_FORMATS = {int: 'q', float: 'd'}
+ATTRS_DTYPES = {int: '<i8', float: '<f8'}
+
+
+class BinaryParser:
+    """
+    This class encodes events as fixed size binary records, and decodes
+    batches of such records back to events without parsing text.
+    The layout of a record is derived from the attributes types of the
+    dataset kind (all its event types share the same attributes): the index
+    of the event type, then the attributes by the order of attrs_names, and
+    then the window size of the event.
+    """
+    def __init__(self, type_name_to_obj: typing.Dict[str, EventType]):
+        # the generator and the processor index the event types the same way
+        self.types = [type_name_to_obj[name] for name in
+                      sorted(type_name_to_obj.keys())]
+        self.type_name_to_index = {event_type.name: i for i, event_type in
+                                   enumerate(self.types)}
+        self.attrs_types = self.types[0].attrs_types
+        self.record = struct.Struct(
+            '<H' + ''.join([ATTRS_FORMATS[attr_type] for attr_type in
+                            self.attrs_types]) + 'q')
+        # the same layout as a NumPy record, for viewing batches as columns
+        self.record_dtype = np.dtype(
+            [('type', '<u2')] + [(f'attr_{i}', ATTRS_DTYPES[attr_type]) for
+                                 i, attr_type in enumerate(self.attrs_types)] +
+            [('ws', '<i8')])
+
+    def encode_event(self, event_str: str, ws: str) -> bytes:
+        type_name, *attrs = event_str.split(',')
+        # empty attributes are zero, as in parsing text
+        values = [t(i) if i else t() for i, t in zip(attrs, self.attrs_types)]
+        return self.encode_values(type_name, values, int(ws))
+
+    def encode_values(self, type_name: str, values: typing.Sequence,
+                      ws: int) -> bytes:
+        """
+        Encodes an event given by its typed attributes values
+        """
+        return self.record.pack(self.type_name_to_index[type_name], *values,
+                                ws)
+
+    def get_num_events(self, payload: bytes) -> int:
+        return len(payload) // self.record.size
+
+    def parse_columns(self, payload: bytes) -> \
+            typing.Tuple[np.ndarray, typing.List[np.ndarray]]:
+        """
+        Views the records as NumPy columns, without copying them: the indexes
+        of the events types (in self.types) and the column of every attribute
+        """
+        records = np.frombuffer(payload, dtype=self.record_dtype)
+        return records['type'], [records[f'attr_{i}'] for i in
+                                  range(len(self.attrs_types))]
+
+    def get_values(self, type_indexes: np.ndarray,
+                   columns: typing.List[np.ndarray]) -> \
+            typing.Iterator[typing.Tuple[EventType, typing.Tuple]]:
+        """
+        Yields the type and the attributes values of every event of the
+        columns (see parse_columns), without creating the events. The columns
+        are converted to Python values at once
+        """
+        types = self.types
+        return zip([types[i] for i in type_indexes.tolist()],
+                   zip(*[column.tolist() for column in columns]))
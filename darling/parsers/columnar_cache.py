@@ -0,0 +1,267 @@
+import itertools
+import json
+import mmap
+import multiprocessing.pool
+import os
+import typing
+
+import numpy as np
+
+# the dtypes of the attributes columns, by the attributes types
+COLUMNS_DTYPES = {int: np.int64, float: np.float64}
+# the number of rows converted at once, when building and reading the cache
+CHUNK_SIZE = 2 ** 16
+# the number of bytes of the dataset file scanned at once for the lines ends
+BYTES_CHUNK_SIZE = 2 ** 24
+NEWLINE = ord('\n')
+
+
+class ColumnarCache:
+    """
+    This class keeps a dataset file in a columnar layout: every attribute is
+    a NumPy file of its values by the order of the dataset lines, along with
+    the event type of every line, an index of the rows of every event type
+    and the offsets of the lines in the dataset file. The files (and the
+    dataset file) are memory mapped, so the events are read without parsing
+    text and without loading the dataset to memory.
+    The cache is built once from the dataset file (see build), and is used as
+    long as the dataset file is not modified and it is read with the same
+    attributes and window sizes it was built with.
+    """
+    META_FILE = 'meta.json'
+    TYPES_FILE = 'types.npy'
+    WS_FILE = 'ws.npy'
+    TYPE_ROWS_FILE = 'type_rows.npy'
+    TYPE_OFFSETS_FILE = 'type_offsets.npy'
+    LINES_OFFSETS_FILE = 'lines_offsets.npy'
+
+    def __init__(self, data_file: str, cache_dir: str, meta: typing.Dict):
+        self.types_names = meta['types_names']
+        self.type_name_to_index = {type_name: i for i, type_name in
+                                   enumerate(self.types_names)}
+        self.attrs_names = meta['attrs_names']
+        self.size = meta['size']
+        load = lambda name: np.load(os.path.join(cache_dir, name),
+                                    mmap_mode='r')
+        self.columns = [load(f'{attr_name}.npy') for attr_name in
+                        self.attrs_names]
+        self.types = load(self.TYPES_FILE)
+        self.ws = load(self.WS_FILE) if meta['with_ws'] else None
+        # the rows of the i-th event type are
+        # type_rows[type_offsets[i]:type_offsets[i + 1]], in ascending order
+        self.type_rows = load(self.TYPE_ROWS_FILE)
+        self.type_offsets = load(self.TYPE_OFFSETS_FILE)
+        # the i-th line is data[lines_offsets[i]:lines_offsets[i + 1]]
+        self.lines_offsets = load(self.LINES_OFFSETS_FILE)
+        with open(data_file, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def get_cache_dir(data_file: str) -> str:
+        """
+        Returns the folder of the cache of the dataset file: next to it, or
+        under DATA_CACHE by the dataset file's absolute path, so every dataset
+        file gets its own folder
+        """
+        cache_root = os.environ.get('DATA_CACHE')
+        if cache_root is None:
+            return f'{data_file}.cache'
+        return os.path.join(cache_root,
+                            f'{os.path.abspath(data_file).lstrip(os.sep)}'
+                            f'.cache')
+
+    @staticmethod
+    def _get_source_stat(data_file: str) -> typing.Dict:
+        stat = os.stat(data_file)
+        return {'source_file': os.path.abspath(data_file),
+                'source_size': stat.st_size, 'source_mtime': stat.st_mtime}
+
+    @staticmethod
+    def _get_key(attrs_names: typing.List[str],
+                 attrs_types: typing.List[type], with_ws: bool) -> \
+            typing.Dict:
+        # the parameters the columns of the cache depend on
+        return {'attrs_names': list(attrs_names),
+                'attrs_types': [attr_type.__name__ for attr_type in
+                                attrs_types],
+                'with_ws': with_ws}
+
+    @classmethod
+    def load(cls, data_file: str, attrs_names: typing.List[str],
+             attrs_types: typing.List[type], with_ws: bool) -> \
+            typing.Optional['ColumnarCache']:
+        """
+        Returns the cache of the dataset file, or None if it was not built,
+        it was built of another file, the dataset file was modified since or
+        the cache was built with other
+        attributes or window sizes
+        """
+        cache_dir = cls.get_cache_dir(data_file)
+        meta_file = os.path.join(cache_dir, cls.META_FILE)
+        if not os.path.exists(meta_file):
+            return None
+        with open(meta_file) as f:
+            meta = json.load(f)
+        source_stat = cls._get_source_stat(data_file)
+        if any(meta.get(key) != value for key, value in source_stat.items()):
+            print(f'the cache {cache_dir} is not of the current {data_file}, '
+                  f'reading the dataset file')
+            return None
+        key = cls._get_key(attrs_names, attrs_types, with_ws)
+        if any(meta.get(name) != value for name, value in key.items()):
+            print(f'the cache {cache_dir} was built with other attributes or '
+                  f'window sizes, reading the dataset file')
+            return None
+        return cls(data_file, cache_dir, meta)
+
+    @classmethod
+    def build(cls, data_file: str, attrs_names: typing.List[str],
+              attrs_types: typing.List[type], with_ws: bool,
+              pool: multiprocessing.pool.Pool = None) -> 'ColumnarCache':
+        """
+        Converts the dataset file to its cache, where with_ws tells if every
+        line ends with the window size of its event. The lines are counted and
+        indexed first, so every chunk of lines is converted to its part of the
+        memory mapped columns on its own - by the processes of the pool, if
+        given. The dataset is never held in memory
+        """
+        cache_dir = cls.get_cache_dir(data_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(data_file, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        chunks_starts = range(0, len(data), BYTES_CHUNK_SIZE)
+        read_chunk = lambda start: np.frombuffer(
+            data[start:start + BYTES_CHUNK_SIZE], dtype=np.uint8)
+        size = sum(int(np.count_nonzero(read_chunk(start) == NEWLINE)) for
+                   start in chunks_starts)
+        if data[-1:] != b'\n':
+            # the last line has no newline
+            size += 1
+        create = lambda name, dtype, shape=(size,): \
+            np.lib.format.open_memmap(os.path.join(cache_dir, name),
+                                      mode='w+', dtype=dtype, shape=shape)
+        # every line starts after the newline of the previous one
+        lines_offsets = create(cls.LINES_OFFSETS_FILE, np.int64, (size + 1,))
+        lines_offsets[0], lines_offsets[size] = 0, len(data)
+        line = 1
+        for start in chunks_starts:
+            ends = np.flatnonzero(read_chunk(start) == NEWLINE)[:size - line]
+            lines_offsets[line:line + len(ends)] = ends + start + 1
+            line += len(ends)
+        data.close()
+        # the columns files are created here, and filled by the chunks
+        for attr_name, attr_type in zip(attrs_names, attrs_types):
+            create(f'{attr_name}.npy', COLUMNS_DTYPES[attr_type]).flush()
+        if with_ws:
+            create(cls.WS_FILE, np.int64).flush()
+        types = create(cls.TYPES_FILE, np.uint32)
+        chunks = [(data_file, cache_dir, attrs_names, attrs_types, with_ws,
+                   start, min(start + CHUNK_SIZE, size),
+                   int(lines_offsets[start]),
+                   int(lines_offsets[min(start + CHUNK_SIZE, size)]))
+                  for start in range(0, size, CHUNK_SIZE)]
+        type_name_to_index = {}
+        converted = map(_convert_chunk, chunks) if pool is None else \
+            pool.imap(_convert_chunk, chunks)
+        for start, end, chunk_types_names, chunk_types in converted:
+            # the indexes of the chunk's event types are made global
+            chunk_types_indexes = np.array([
+                type_name_to_index.setdefault(type_name,
+                                              len(type_name_to_index))
+                for type_name in chunk_types_names], dtype=np.uint32)
+            types[start:end] = chunk_types_indexes[chunk_types]
+        type_rows = np.argsort(types, kind='stable')
+        type_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(types,
+                                        minlength=len(type_name_to_index)))])
+        np.save(os.path.join(cache_dir, cls.TYPE_ROWS_FILE), type_rows)
+        np.save(os.path.join(cache_dir, cls.TYPE_OFFSETS_FILE), type_offsets)
+        types.flush()
+        lines_offsets.flush()
+        meta = {
+            'types_names': list(type_name_to_index.keys()),
+            'size': size,
+            **cls._get_key(attrs_names, attrs_types, with_ws),
+            **cls._get_source_stat(data_file)
+        }
+        with open(os.path.join(cache_dir, cls.META_FILE), 'w') as f:
+            json.dump(meta, f)
+        return cls(data_file, cache_dir, meta)
+
+    def get_rows(self, types_names: typing.Iterable[str], size: int) -> \
+            np.ndarray:
+        """
+        Returns the rows of the events of the given types among the first
+        size lines of the dataset, by their order in the dataset
+        """
+        rows = []
+        for type_name in types_names:
+            i = self.type_name_to_index.get(type_name)
+            if i is None:
+                continue
+            type_rows = self.type_rows[self.type_offsets[i]:
+                                       self.type_offsets[i + 1]]
+            rows.append(type_rows[:np.searchsorted(type_rows, size)])
+        if not rows:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(rows))
+
+    def iter_values(self, rows: np.ndarray) -> \
+            typing.Iterator[typing.Tuple[int, str, typing.Tuple, int]]:
+        """
+        Yields the row, the type name, the attributes values and the window
+        size of the event of every given row. The rows are read from the
+        columns in chunks, and converted to Python values at once
+        """
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            types = [self.types_names[i] for i in self.types[chunk].tolist()]
+            values = zip(*[column[chunk].tolist() for column in
+                           self.columns])
+            ws = self.ws[chunk].tolist() if self.ws is not None else \
+                itertools.repeat(0)
+            yield from zip(chunk.tolist(), types, values, ws)
+
+    def iter_lines(self, rows: np.ndarray) -> \
+            typing.Iterator[typing.Tuple[int, str]]:
+        """
+        Yields the row and the line (without its newline) of every given row,
+        sliced from the memory mapped dataset file
+        """
+        data, lines_offsets = self.data, self.lines_offsets
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            for row, line_start, line_end in zip(
+                    chunk.tolist(), lines_offsets[chunk].tolist(),
+                    lines_offsets[chunk + 1].tolist()):
+                yield row, data[line_start:line_end].decode().rstrip('\n')
+
+
+def _convert_chunk(chunk: typing.Tuple) -> \
+        typing.Tuple[int, int, typing.List[str], np.ndarray]:
+    """
+    Converts a chunk of lines of a dataset file to its part of the columns of
+    the cache (see ColumnarCache.build). Returns the rows of the chunk, the
+    names of its event types and the index of the event type of every row
+    among these names
+    """
+    data_file, cache_dir, attrs_names, attrs_types, with_ws, start, end, \
+        data_start, data_end = chunk
+    with open(data_file, 'rb') as f:
+        f.seek(data_start)
+        lines = f.read(data_end - data_start).decode().split('\n')
+    rows = [line.split(',') for line in lines[:end - start]]
+    load = lambda name: np.load(os.path.join(cache_dir, name), mmap_mode='r+')
+    for i, (attr_name, attr_type) in enumerate(zip(attrs_names, attrs_types)):
+        column = load(f'{attr_name}.npy')
+        # empty attributes are zero, as in parsing text
+        column[start:end] = [attr_type(row[i + 1]) if row[i + 1] else 0 for
+                             row in rows]
+        column.flush()
+    if with_ws:
+        ws = load(ColumnarCache.WS_FILE)
+        ws[start:end] = [int(row[-1]) for row in rows]
+        ws.flush()
+    types_names, types = np.unique([row[0] for row in rows],
+                                   return_inverse=True)
+    return start, end, types_names.tolist(), types
@@ -1,156 +1,259 @@
-from objects.event_type import EventType
-from objects.event import Event
-from abc import ABC, abstractmethod
-from patterns.exceptions import InvalidConditionParams
-import scipy.stats
-import typing
-
-
-class Condition(ABC):
-    def __init__(self, desc: str, event_types: typing.List[EventType],
-                 attr_1: str, attr_2: str, const: str, op_name: str, op_func:
-            typing.Callable, selectivity: float = None, user_input: bool =
-                 True, double_by=None, free_var_op=None, free_var=None):
-        self.desc = desc
-        self.event_types = event_types
-        self.contains_kleene = any([event_type.kleene for event_type in self.event_types])
-        self.attr_1 = attr_1
-        self.attr_2 = attr_2
-        self.const = const
-        self.op_name = op_name
-        self.op_func = op_func
-        self.selectivity = selectivity
-        self.func = self._gen_func()
-        self.double_by = None if double_by is None else float(double_by)
-        if free_var_op is None and free_var is None:
-            self.free_var = None
-        elif free_var_op == '-':
-            self.free_var = float(free_var) * (-1)
-        elif free_var_op == '+':
-            self.free_var = float(free_var)
-        else:
-            self.free_var = float(free_var)
-        self.user_input = user_input
-        self.abs = False
-        if user_input:
-            self.custom_verifiers_by_type = self._gen_custom_verifiers_by_attr()
-
-    def __len__(self):
-        return len(self.event_types)
-
-    def get_other_type(self, event_type) -> EventType:
-        for type_ in self.event_types:
-            if type_ != event_type:
-                return type_
-        return None
-
-    def _gen_func(self):
-        if self.attr_2 is None:
-            return lambda e: self.op_func(e.attrs[self.attr_1], self.const)
-        else:
-            return lambda e_1, e_2: self.op_func(e_1.attrs[self.attr_1],
-                                            e_2.attrs[self.attr_2])
-
-    def _gen_custom_verifiers_by_attr(self):
-        """
-        This method returns 2 functions for each attribute that uses the normal
-        distribution in order to estimate the probability of event to create a
-        match and pass the conditions
-        :return:
-        """
-        if '|' in self.desc:
-            # it is an abs query
-            mu1, sigma1 = self.event_types[0].attrs_dist_params.get(self.attr_1)
-            mu2, sigma2 = self.event_types[1].attrs_dist_params.get(self.attr_2)
-            attr_1_norm = scipy.stats.norm(mu1, sigma1)
-            attr_2_norm = scipy.stats.norm(mu2, sigma2)
-
-            def f1_(e_1):
-                attr = e_1.attrs[self.attr_1]
-                norm = scipy.stats.norm(mu2 - attr, sigma2)
-                return norm.cdf(self.free_var) - norm.cdf((-1) * self.free_var)
-
-            def f2_(e_2):
-                attr = e_2.attrs[self.attr_2]
-                norm = scipy.stats.norm(mu1 - attr, sigma1)
-                return norm.cdf(self.free_var) - norm.cdf((-1) * self.free_var)
-
-            return {
-                self.event_types[0]: f1_,
-                self.event_types[1]: f2_
-            }
-
-        if len(self.event_types) == 1:
-            return None
-        attr_1_norm = scipy.stats.norm(*self.event_types[0].
-                                       attrs_dist_params.get(self.attr_1))
-        mu2, sigma2 = self.event_types[1].attrs_dist_params.get(self.attr_2)
-        if self.double_by is not None:
-            mu2 *= self.double_by
-            sigma2 *= self.double_by
-
-        if self.free_var is not None:
-            mu2 += self.free_var
-
-        double_by = 1 if self.double_by is None else self.double_by
-        free_var = 0 if self.free_var is None else self.free_var
-
-        attr_2_norm = scipy.stats.norm(mu2, sigma2)
-        if self.op_name == '<':
-            f1 = lambda e_1: 1 - attr_2_norm.cdf(e_1.attrs[self.attr_1])
-            f2 = lambda e_2: attr_1_norm.cdf(e_2.attrs[self.attr_2] *
-                                             double_by + free_var)
-        elif self.op_name == '>':
-            f1 = lambda e_1: attr_2_norm.cdf(e_1.attrs[self.attr_1])
-            f2 = lambda e_2: 1 - attr_1_norm.cdf(e_2.attrs[self.attr_2] *
-                                                 double_by + free_var)
-        elif self.op_name == '=':
-            f1 = lambda e_1: attr_2_norm.pdf(e_1.attrs[self.attr_1])
-            f2 = lambda e_2: attr_1_norm.pdf(e_2.attrs[self.attr_2] *
-                                             double_by + free_var)
-
-        return {
-            self.event_types[0]: f1,
-            self.event_types[1]: f2
-        }
-
-    def verify(self, *events: Event) -> bool:
-        if not self.contains_kleene:
-            self._check_arguments(events)
-            ordered_events = self._order_events(events)
-            return self.func(*ordered_events)
-        elif len(self.event_types) == 1:
-            #unary condition for kleene+
-            for event in events:
-                if not self.func(event):
-                    return False
-            return True
-        else:
-            # binary condition for kleene
-            # in kleene, we check "and" of the conditions
-            first_arg_events = [event for event in events if self.event_types[
-                0].name == event.type.name]
-            second_arg_events = [event for event in events if self.event_types[
-                1].name == event.type.name]
-            if len(first_arg_events) > len(second_arg_events):
-                # first arg is the kleene
-                e2 = second_arg_events[0]
-                for e1 in first_arg_events:
-                    if not self.func(e1, e2):
-                        return False
-            else:
-                # second arg is kleene
-                e1 = first_arg_events[0]
-                for e2 in second_arg_events:
-                    if not self.func(e1, e2):
-                        return False
-            return True
-
-    def _order_events(self, events: typing.Tuple[Event]) -> typing.Iterable[Event]:
-        # Assuming len(events) <= 2
-        return events if self.event_types[0].name == events[0].type.name else\
-            reversed(events)
-
-    def _check_arguments(self, events: typing.Tuple[Event]):
-        if len(events) != len(self.event_types):
-            raise InvalidConditionParams('Not enough or too much events')
+import ast
+import math
+
+from objects.event_type import EventType
+from objects.event import Event
+from abc import ABC, abstractmethod
+from patterns.conditions.empirical_distribution import \
+    EmpiricalDistribution
+from patterns.exceptions import InvalidConditionParams
+from patterns.operator import gen_operand_transform
+import numpy as np
+from scipy.special import ndtr
+import typing
+
+_NORM_PDF_C = math.sqrt(2 * math.pi)
+
+
+def _norm_pdf(x, mu: float, sigma: float):
+    # computed as scipy.stats.norm(mu, sigma).pdf(x) does, so the results are
+    # identical: the exponential of an array may differ from that of a scalar
+    z = (x - mu) / sigma
+    pdf = np.exp(np.atleast_1d(-(z * z) / 2.0)) / _NORM_PDF_C / sigma
+    return pdf if np.ndim(x) else pdf[0]
+
+
+class Condition(ABC):
+    def __init__(self, desc: str, event_types: typing.List[EventType],
+                 attr_1: str, attr_2: str, const: str, op_name: str, op_func:
+            typing.Callable, selectivity: float = None, user_input: bool =
+                 True, double_by=None, free_var_op=None, free_var=None):
+        self.desc = desc
+        self.event_types = event_types
+        self.contains_kleene = any([event_type.kleene for event_type in self.event_types])
+        self.attr_1 = attr_1
+        self.attr_2 = attr_2
+        self.const = const
+        self.op_name = op_name
+        self.op_func = op_func
+        self.selectivity = selectivity
+        # the events hold their attributes by position
+        self.attr_1_index = self.event_types[0].get_attr_index(attr_1)
+        self.attr_2_index = None if attr_2 is None else \
+            self.event_types[-1].get_attr_index(attr_2)
+        # the constant is parsed once, since the operator compares values
+        self.const_value = None if attr_2 is not None else \
+            ast.literal_eval(const)
+        self.func = self._gen_func()
+        self.double_by = None if double_by is None else float(double_by)
+        # the transformation of attr_2 before comparing it to attr_1
+        self.operand_transform = gen_operand_transform(double_by, free_var_op,
+                                                       free_var)
+        if free_var_op is None and free_var is None:
+            self.free_var = None
+        elif free_var_op == '-':
+            self.free_var = float(free_var) * (-1)
+        elif free_var_op == '+':
+            self.free_var = float(free_var)
+        else:
+            self.free_var = float(free_var)
+        self.user_input = user_input
+        self.abs = False
+        if user_input:
+            self.custom_verifiers_by_type = self._gen_custom_verifiers_by_attr()
+
+    def __len__(self):
+        return len(self.event_types)
+
+    def get_other_type(self, event_type) -> EventType:
+        for type_ in self.event_types:
+            if type_ != event_type:
+                return type_
+        return None
+
+    def _gen_func(self):
+        op_func, attr_1_index = self.op_func, self.attr_1_index
+        if self.attr_2 is None:
+            const = self.const_value
+            return lambda e: op_func(e.values[attr_1_index], const)
+        else:
+            attr_2_index = self.attr_2_index
+            return lambda e_1, e_2: op_func(e_1.values[attr_1_index],
+                                            e_2.values[attr_2_index])
+
+    def _gen_custom_verifiers_by_attr(self):
+        """
+        This method returns 2 functions for each attribute that uses the normal
+        distribution in order to estimate the probability of event to create a
+        match and pass the conditions.
+        The functions get the attributes values of the event (Event.values),
+        or the NumPy columns of the values of a batch of events (see
+        LeafNode.batch_utility_func)
+        The distributions' parameters are bound when the pattern is parsed,
+        and the normal CDF is computed by scipy.special.ndtr (as
+        scipy.stats.norm computes it, without creating distribution objects)
+        :return:
+        """
+        attr_1_index, attr_2_index = self.attr_1_index, self.attr_2_index
+        if '|' in self.desc:
+            # it is an abs query
+            mu1, sigma1 = self.event_types[0].attrs_dist_params.get(self.attr_1)
+            mu2, sigma2 = self.event_types[1].attrs_dist_params.get(self.attr_2)
+            free_var, neg_free_var = self.free_var, (-1) * self.free_var
+
+            def f1_(values_1):
+                # the probability of |x - attr| <= free_var, x ~ N(mu2, sigma2)
+                loc = mu2 - values_1[attr_1_index]
+                return ndtr((free_var - loc) / sigma2) - \
+                    ndtr((neg_free_var - loc) / sigma2)
+
+            def f2_(values_2):
+                loc = mu1 - values_2[attr_2_index]
+                return ndtr((free_var - loc) / sigma1) - \
+                    ndtr((neg_free_var - loc) / sigma1)
+
+            return {
+                self.event_types[0]: f1_,
+                self.event_types[1]: f2_
+            }
+
+        if len(self.event_types) == 1:
+            return None
+        mu1, sigma1 = self.event_types[0].attrs_dist_params.get(self.attr_1)
+        mu2, sigma2 = self.event_types[1].attrs_dist_params.get(self.attr_2)
+        if self.double_by is not None:
+            mu2 *= self.double_by
+            sigma2 *= self.double_by
+
+        if self.free_var is not None:
+            mu2 += self.free_var
+
+        double_by = 1 if self.double_by is None else self.double_by
+        free_var = 0 if self.free_var is None else self.free_var
+
+        if self.op_name == '<':
+            f1 = lambda values_1: 1 - ndtr(
+                (values_1[attr_1_index] - mu2) / sigma2)
+            f2 = lambda values_2: ndtr(
+                (values_2[attr_2_index] * double_by + free_var - mu1) / sigma1)
+        elif self.op_name == '>':
+            f1 = lambda values_1: ndtr((values_1[attr_1_index] - mu2) / sigma2)
+            f2 = lambda values_2: 1 - ndtr(
+                (values_2[attr_2_index] * double_by + free_var - mu1) / sigma1)
+        elif self.op_name == '=':
+            f1 = lambda values_1: _norm_pdf(values_1[attr_1_index], mu2,
+                                            sigma2)
+            f2 = lambda values_2: _norm_pdf(
+                values_2[attr_2_index] * double_by + free_var, mu1, sigma1)
+
+        return {
+            self.event_types[0]: f1,
+            self.event_types[1]: f2
+        }
+
+    def set_empirical_verifiers(self, types_to_values: typing.Dict[
+            EventType, typing.List[typing.Sequence]], bins: int):
+        """
+        Replaces the verifiers of the normal distribution by verifiers of the
+        empirical distributions of the attributes (see EmpiricalDistribution),
+        estimated from the given attributes values of sampled events (e.g. of
+        the warm up). The verifiers are kept if a type has no sampled events.
+        The verifiers compute the same probabilities as those of the normal
+        distribution, by the CDF (or the density) of the other attribute
+        """
+        values_1 = types_to_values.get(self.event_types[0])
+        values_2 = types_to_values.get(self.event_types[-1])
+        if not self.user_input or len(self) == 1 or not values_1 or \
+                not values_2:
+            return
+        attr_1_index, attr_2_index = self.attr_1_index, self.attr_2_index
+        samples_1 = np.array([values[attr_1_index] for values in values_1],
+                             dtype=np.float64)
+        samples_2 = np.array([values[attr_2_index] for values in values_2],
+                             dtype=np.float64)
+        dist_1 = EmpiricalDistribution(samples_1, bins)
+        if '|' in self.desc:
+            # the probability of |x - attr| <= free_var, by the CDF of attr
+            dist_2 = EmpiricalDistribution(samples_2, bins)
+            free_var = self.free_var
+
+            def f1(values_1):
+                value = values_1[attr_1_index]
+                return dist_2.cdf(value + free_var) - \
+                    dist_2.cdf(value - free_var)
+
+            def f2(values_2):
+                value = values_2[attr_2_index]
+                return dist_1.cdf(value + free_var) - \
+                    dist_1.cdf(value - free_var)
+        else:
+            # attr_1 is compared to the transformed attr_2, whose distribution
+            # is that of the transformed samples
+            transform = self.operand_transform
+            if transform is None:
+                transform = lambda value: value
+            dist_2 = EmpiricalDistribution(transform(samples_2), bins)
+            if self.op_name == '<':
+                f1 = lambda values_1: 1 - dist_2.cdf(values_1[attr_1_index])
+                f2 = lambda values_2: dist_1.cdf(
+                    transform(values_2[attr_2_index]))
+            elif self.op_name == '>':
+                f1 = lambda values_1: dist_2.cdf(values_1[attr_1_index])
+                f2 = lambda values_2: 1 - dist_1.cdf(
+                    transform(values_2[attr_2_index]))
+            elif self.op_name == '=':
+                f1 = lambda values_1: dist_2.pdf(values_1[attr_1_index])
+                f2 = lambda values_2: dist_1.pdf(
+                    transform(values_2[attr_2_index]))
+        self.custom_verifiers_by_type = {
+            self.event_types[0]: f1,
+            self.event_types[1]: f2
+        }
+
+    def verify(self, *events: Event) -> bool:
+        if not self.contains_kleene:
+            self._check_arguments(events)
+            ordered_events = self._order_events(events)
+            return self.func(*ordered_events)
+        elif len(self.event_types) == 1:
+            #unary condition for kleene+
+            for event in events:
+                if not self.func(event):
+                    return False
+            return True
+        else:
+            # binary condition for kleene
+            # in kleene, we check "and" of the conditions
+            first_arg_events = [event for event in events if self.event_types[
+                0].name == event.type.name]
+            second_arg_events = [event for event in events if self.event_types[
+                1].name == event.type.name]
+            if len(first_arg_events) > len(second_arg_events):
+                # first arg is the kleene
+                e2 = second_arg_events[0]
+                for e1 in first_arg_events:
+                    if not self.func(e1, e2):
+                        return False
+            else:
+                # second arg is kleene
+                e1 = first_arg_events[0]
+                for e2 in second_arg_events:
+                    if not self.func(e1, e2):
+                        return False
+            return True
+
+    def verify_values(self, values: typing.Sequence) -> bool:
+        """
+        Verifies a unary condition on the attributes values of an event (or on
+        the NumPy columns of a batch of events, returning a mask)
+        """
+        return self.op_func(values[self.attr_1_index], self.const_value)
+
+    def _order_events(self, events: typing.Tuple[Event]) -> typing.Iterable[Event]:
+        # Assuming len(events) <= 2
+        return events if self.event_types[0].name == events[0].type.name else\
+            reversed(events)
+
+    def _check_arguments(self, events: typing.Tuple[Event]):
+        if len(events) != len(self.event_types):
+            raise InvalidConditionParams('Not enough or too much events')
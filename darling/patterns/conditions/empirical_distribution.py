@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class EmpiricalDistribution:
+    """
+    This class estimates the distribution of an attribute by a histogram of
+    equal width bins of its sampled values (e.g. from the warm up). Its CDF
+    is linear within every bin and its density is constant, so both are
+    looked up in O(1) by the bin of a value, for a value or a NumPy array of
+    values (with the same results).
+    """
+    def __init__(self, samples: np.ndarray, bins: int):
+        low, high = float(samples.min()), float(samples.max())
+        if low == high:
+            # a constant attribute, in a single bin around its value
+            low, high = low - 0.5, high + 0.5
+        counts, _ = np.histogram(samples, bins, (low, high))
+        self.low = low
+        self.bins = bins
+        self.scale = bins / (high - low)
+        self.mass = counts / len(samples)
+        # the CDF at the edges of the bins
+        self.edges_cdf = np.concatenate([[0], np.cumsum(self.mass)])
+        self.edges_cdf[-1] = 1
+        self.density = self.mass * self.scale
+        # the scalar lookups index lists, which is faster than arrays
+        self._mass = self.mass.tolist()
+        self._edges_cdf = self.edges_cdf.tolist()
+        self._density = self.density.tolist()
+
+    def cdf(self, x):
+        if isinstance(x, np.ndarray):
+            pos = np.clip((x - self.low) * self.scale, 0, self.bins)
+            i = np.minimum(pos.astype(np.int64), self.bins - 1)
+            return np.where(pos < self.bins, self.edges_cdf[i] +
+                            (pos - i) * self.mass[i], 1.0)
+        pos = (x - self.low) * self.scale
+        if pos <= 0:
+            return 0.0
+        if pos >= self.bins:
+            return 1.0
+        i = int(pos)
+        return self._edges_cdf[i] + (pos - i) * self._mass[i]
+
+    def pdf(self, x):
+        if isinstance(x, np.ndarray):
+            pos = (x - self.low) * self.scale
+            i = np.clip(pos, 0, self.bins - 1).astype(np.int64)
+            return np.where((pos >= 0) & (pos < self.bins), self.density[i],
+                            0.0)
+        pos = (x - self.low) * self.scale
+        if pos < 0 or pos >= self.bins:
+            return 0.0
+        return self._density[int(pos)]
@@ -1 +1 @@
-TIME_KEY = 'time'
+TIME_KEY = 'time'
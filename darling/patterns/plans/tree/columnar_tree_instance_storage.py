@@ -0,0 +1,165 @@
+import typing
+
+import numpy as np
+
+from patterns.plans.tree.node.node import Node
+from patterns.plans.tree.tree_instance_index import TreeInstanceIndex
+from patterns.plans.tree.tree_instance_storage import TreeInstanceStorage
+
+INITIAL_CAPACITY = 1024
+
+
+class InstanceColumns:
+    """
+    This class holds the values the conditions compare of a node's instances
+    as NumPy columns (one per indexed condition, typed by its keys - see
+    TreeInstanceIndex.get_key_dtype), parallel to the node's instances list,
+    along with an object column of the instances themselves, so the
+    instances passing a mask are gathered at once.
+    The expired instances are a prefix of the list, so they are dropped by
+    moving the start of the live region. The instances mostly arrive by
+    their timestamps, so they are appended to the columns, which are doubled
+    when full.
+    """
+    def __init__(self):
+        self.indexes = []
+        self.columns = []
+        self.instances = None
+        self.start = 0
+        self.length = 0
+
+    def add_index(self, index: TreeInstanceIndex, instances: typing.List):
+        self.indexes.append(index)
+        self.build(instances)
+
+    def _alloc(self, capacity: int) -> typing.List[np.ndarray]:
+        return [np.empty(capacity, dtype=index.get_key_dtype()) for index in
+                self.indexes]
+
+    def build(self, instances: typing.List):
+        capacity = max(INITIAL_CAPACITY, 2 * len(instances))
+        self.columns = self._alloc(capacity)
+        self.instances = np.empty(capacity, dtype=object)
+        for i, instance in enumerate(instances):
+            self._set_values(i, instance)
+        self.start = 0
+        self.length = len(instances)
+
+    def _set_values(self, position: int, instance):
+        self.instances[position] = instance
+        for column, index in zip(self.columns, self.indexes):
+            column[position] = index.get_key(instance)
+
+    def _grow(self):
+        # also compacts the live region to the beginning of the columns
+        capacity = max(INITIAL_CAPACITY, 2 * self.length)
+        end = self.start + self.length
+        columns = self._alloc(capacity)
+        for column, old_column in zip(columns, self.columns):
+            column[:self.length] = old_column[self.start:end]
+        instances = np.empty(capacity, dtype=object)
+        instances[:self.length] = self.instances[self.start:end]
+        self.columns = columns
+        self.instances = instances
+        self.start = 0
+
+    def insert(self, position: int, instance):
+        if self.start + self.length == len(self.instances):
+            self._grow()
+        position += self.start
+        end = self.start + self.length
+        if position < end:
+            # an instance that started before the last one - only the
+            # instances after it are shifted
+            for column in self.columns + [self.instances]:
+                column[position + 1:end + 1] = column[position:end]
+        self._set_values(position, instance)
+        self.length += 1
+
+    def delete_first(self, n: int):
+        # the instances are released
+        self.instances[self.start:self.start + n] = None
+        self.length -= n
+        self.start = self.start + n if self.length else 0
+
+    def clear(self):
+        if self.length:
+            self.instances[self.start:self.start + self.length] = None
+        self.start = 0
+        self.length = 0
+
+    def get_mask(self, peer_instance) -> np.ndarray:
+        """
+        Tests all the live instances against the peer instance at once
+        """
+        mask = None
+        for column, index in zip(self.columns, self.indexes):
+            column_mask = index.get_column_mask(
+                column[self.start:self.start + self.length],
+                index.get_probe(peer_instance))
+            mask = column_mask if mask is None else \
+                np.logical_and(mask, column_mask, out=mask)
+        return mask
+
+    def get_instances(self, mask: np.ndarray) -> typing.List:
+        """
+        Returns the live instances passing the mask (see get_mask)
+        """
+        return self.instances[self.start:self.start + self.length][
+            np.flatnonzero(mask)].tolist()
+
+
+class ColumnarTreeInstanceStorage(TreeInstanceStorage):
+    """
+    A storage that keeps, next to the instances of each node, NumPy columns
+    of the values the conditions of the node's parent compare.
+    A new instance is tested against all of its peers with one vectorized
+    predicate mask, and only the peers that pass it are returned for creating
+    parent instances.
+    The conditions that can be indexed (see gen_index) are the ones that are
+    kept as columns.
+    """
+    def __init__(self, root: Node):
+        super().__init__(root)
+        self.node_to_columns = {node: InstanceColumns()
+                                for node in self.node_to_instances.keys()}
+
+    def add_index(self, node, index: TreeInstanceIndex):
+        # the index is only used for its key and predicate
+        self.node_to_columns.get(node).add_index(
+            index, self.node_to_instances.get(node))
+
+    def add_instance(self, instance):
+        position = self._insert_instance(instance)
+        columns = self.node_to_columns.get(instance.current_node)
+        if columns.indexes:
+            columns.insert(position, instance)
+        self.size += instance.size
+
+    def get_peer_instances(self, peer_node, instance, timestamp: float) -> \
+            typing.List:
+        peer_instances = self.remove_expired_instances(peer_node, timestamp)
+        columns = self.node_to_columns.get(peer_node)
+        if not peer_instances or not columns.indexes:
+            return peer_instances
+        return columns.get_instances(columns.get_mask(instance))
+
+    def get_matches(self):
+        matches = super().get_matches()
+        self.node_to_columns.get(self.root).clear()
+        return matches
+
+    def clear_instances(self, node):
+        super().clear_instances(node)
+        self.node_to_columns.get(node).clear()
+
+    def delete_first_instances(self, peer_node, n):
+        super().delete_first_instances(peer_node, n)
+        columns = self.node_to_columns.get(peer_node)
+        if columns.indexes:
+            columns.delete_first(n)
+
+    def clean(self):
+        super().clean()
+        for columns in self.node_to_columns.values():
+            columns.clear()
@@ -1,80 +1,142 @@
-from patterns.plans.tree.node.node import Node
-from objects.event_buffer import EventBuffer
-from objects.event import Event
-from objects.match import Match
-from patterns.exceptions import NonMatchParents
-from typing import TYPE_CHECKING
-from datetime import datetime
-
-if TYPE_CHECKING:
-    from patterns.plans.tree.tree_evaluation_mechanism import EvaluationMechanism
-
-
-class TreeInstance:
-    """
-    This class represents an instance of a tree created during
-    evaluation.
-    """
-    def __init__(self, tree: 'EventsProcessor', node: Node,
-                 match_buffer: EventBuffer = None, kleene = None):
-        self.tree = tree
-        self.current_node = node
-        self.match_buffer = EventBuffer(window=self.tree.time_window)\
-            if match_buffer is None else match_buffer
-        self.size = sum([e.size() for e in self.match_buffer.events])
-        self.kleene = kleene is not None
-
-    def has_match(self):
-        return self.current_node == self.tree.root
-
-    def get_latency(self) -> float:
-        now = datetime.utcnow().timestamp()
-        ts_last_event_inserted = max(map(lambda e: e.system_ts_in_adding,
-                                         self.match_buffer.events))
-        return now - ts_last_event_inserted
-
-    def add_event(self, event: Event):
-        self.match_buffer.add_event(event)
-        self.size += event.size()
-
-    def get_min_timestamp(self):
-        return self.match_buffer.earliest_timestamp
-
-    def get_max_timestamp(self):
-        return self.match_buffer.latest_timestamp
-
-    def validate_conditions(self) -> bool:
-        events = self.match_buffer.events
-        return self.current_node.validate_conditions(events)
-
-    def get_match(self) -> Match:
-        if not self.has_match() or self.match_buffer.is_expired():
-            return None
-        return ','.join([event.name for event in self.match_buffer.events]) +\
-               '\n'
-
-    def is_expired(self, timestamp: float) -> bool:
-        """
-        checks if the current time window has not passed yet
-        """
-        return self.match_buffer.is_expired() or (timestamp and timestamp - \
-               self.match_buffer.earliest_timestamp > self.match_buffer.window)
-
-    def create_parent_instance(self, peer_instance: 'TreeInstance'
-                               ) -> 'TreeInstance':
-        if self.current_node.parent != peer_instance.current_node.parent:
-            raise NonMatchParents()
-        common_parent = self.current_node.parent
-        new_event_buffer = self.match_buffer.clone()
-        for event in peer_instance.match_buffer.events:
-            new_event_buffer.add_event(event)
-        return TreeInstance(self.tree, common_parent, new_event_buffer)
-
-    def create_kleene_instance(self, event: Event) -> 'TreeInstance':
-        node = self.current_node
-        new_event_buffer = self.match_buffer.clone()
-        new_event_buffer.add_event(event)
-        return TreeInstance(self.tree, node, new_event_buffer, True)
-
-    def __str__(self):
-        return f'node: {self.current_node}, buffer: {self.match_buffer}'
+from patterns.plans.tree.node.node import Node
+from objects.event import Event
+from objects.event_type import EventType
+from objects.match import Match
+from patterns.exceptions import NonMatchParents
+from typing import TYPE_CHECKING
+import typing
+from datetime import datetime
+
+if TYPE_CHECKING:
+    from patterns.plans.tree.tree_evaluation_mechanism import EvaluationMechanism
+
+
+class TreeInstance:
+    """
+    This class represents an instance of a tree created during
+    evaluation.
+    An instance created from two instances does not copy their events, but
+    references them (the instance and its peer), and maintains its
+    timestamps, size and latency incrementally. Its events are flattened
+    only when needed (e.g. when the match is emitted).
+    """
+    def __init__(self, tree: 'EvaluationMechanism', node: Node,
+                 events: typing.List[Event] = None, kleene=None,
+                 parents: typing.Tuple['TreeInstance', 'TreeInstance'] = None):
+        self.tree = tree
+        self.current_node = node
+        self.window = self.tree.time_window
+        self.kleene = kleene is not None
+        # either the events of the instance or the two instances it is
+        # created from
+        self.events = events
+        self.parents = parents
+        if parents is not None:
+            (first, second) = parents
+            self.earliest_timestamp = min(first.earliest_timestamp,
+                                          second.earliest_timestamp)
+            self.latest_timestamp = max(first.latest_timestamp,
+                                        second.latest_timestamp)
+            self.latest_system_ts = max(first.latest_system_ts,
+                                        second.latest_system_ts)
+            self.size = first.size + second.size
+            return
+        if self.events is None:
+            self.events = []
+        self.earliest_timestamp, self.latest_timestamp = None, None
+        self.latest_system_ts = None
+        self.size = 0
+        for event in self.events:
+            self._update_by_event(event)
+
+    def _update_by_event(self, event: Event):
+        timestamp = event.get_timestamp()
+        if self.earliest_timestamp is None or timestamp < \
+                self.earliest_timestamp:
+            self.earliest_timestamp = timestamp
+        if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+            self.latest_timestamp = timestamp
+        if self.latest_system_ts is None or event.system_ts_in_adding > \
+                self.latest_system_ts:
+            self.latest_system_ts = event.system_ts_in_adding
+        self.size += event.size()
+
+    def has_match(self):
+        return self.current_node == self.tree.root
+
+    def get_latency(self) -> float:
+        now = datetime.utcnow().timestamp()
+        return now - self.latest_system_ts
+
+    def add_event(self, event: Event):
+        self.events.append(event)
+        self._update_by_event(event)
+
+    def get_events(self) -> typing.List[Event]:
+        if self.events is None:
+            (first, second) = self.parents
+            self.events = first.get_events() + second.get_events()
+        return self.events
+
+    def get_event(self, event_type: EventType) -> typing.Optional[Event]:
+        """
+        Returns the event of the given type by walking down the instances this
+        instance is created from, without flattening its events
+        """
+        instance = self
+        while instance.events is None:
+            (first, second) = instance.parents
+            instance = first if event_type in \
+                first.current_node.event_types_set else second
+        for event in instance.events:
+            if event.type == event_type:
+                return event
+        return None
+
+    def get_min_timestamp(self):
+        return self.earliest_timestamp
+
+    def get_max_timestamp(self):
+        return self.latest_timestamp
+
+    def validate_conditions(self) -> bool:
+        for condition in self.current_node.conditions:
+            events = [self.get_event(event_type) for event_type in
+                      condition.event_types]
+            if condition.contains_kleene or None in events:
+                # validating by all the events of the instance
+                return self.current_node.validate_conditions(
+                    self.get_events())
+            if not condition.verify(*events):
+                return False
+        return True
+
+    def get_match(self) -> Match:
+        if not self.has_match() or self._is_window_exceeded():
+            return None
+        return ','.join([event.name for event in self.get_events()]) + '\n'
+
+    def _is_window_exceeded(self) -> bool:
+        return self.latest_timestamp - self.earliest_timestamp > self.window
+
+    def is_expired(self, timestamp: float) -> bool:
+        """
+        checks if the current time window has not passed yet
+        """
+        return self._is_window_exceeded() or (timestamp and timestamp - \
+               self.earliest_timestamp > self.window)
+
+    def create_parent_instance(self, peer_instance: 'TreeInstance'
+                               ) -> 'TreeInstance':
+        if self.current_node.parent != peer_instance.current_node.parent:
+            raise NonMatchParents()
+        common_parent = self.current_node.parent
+        return TreeInstance(self.tree, common_parent,
+                            parents=(self, peer_instance))
+
+    def create_kleene_instance(self, event: Event) -> 'TreeInstance':
+        node = self.current_node
+        return TreeInstance(self.tree, node, self.get_events() + [event], True)
+
+    def __str__(self):
+        return f'node: {self.current_node}, buffer: {self.get_events()}'
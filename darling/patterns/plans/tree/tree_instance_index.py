@@ -0,0 +1,260 @@
+import collections
+import typing
+from abc import ABC, abstractmethod
+
+import numpy as np
+from sortedcontainers import SortedKeyList
+
+from objects.event_type import EventType
+from patterns.conditions.condition import Condition
+from patterns.plans.tree.node.node import Node
+
+FLIPPED_OPS = {'<': '>', '>': '<', '=': '='}
+
+
+class TreeInstanceIndex(ABC):
+    """
+    This class represents an index over the instances of a single node, built
+    from a binary condition of the node's parent.
+    Given an instance of the node's peer, the index returns only the instances
+    that may satisfy the condition, instead of all of the node's instances.
+    The conditions are still validated on the created parent instances.
+    """
+    # indexes with lower priority are probed first
+    priority = None
+
+    def __init__(self, condition: Condition, event_type: EventType,
+                 other_event_type: EventType):
+        self.condition = condition
+        # the condition's event type held by the indexed node, and the one
+        # held by the peer node
+        self.event_type = event_type
+        self.other_event_type = other_event_type
+        # whether the indexed node holds the left side of the condition
+        self.is_left = event_type == condition.event_types[0]
+        if self.is_left:
+            self.attr, self.other_attr = condition.attr_1, condition.attr_2
+            self.attr_index, self.other_attr_index = \
+                condition.attr_1_index, condition.attr_2_index
+            # the condition is: key <op> probe
+            self.op = condition.op_name
+        else:
+            self.attr, self.other_attr = condition.attr_2, condition.attr_1
+            self.attr_index, self.other_attr_index = \
+                condition.attr_2_index, condition.attr_1_index
+            self.op = FLIPPED_OPS.get(condition.op_name)
+
+    def get_key(self, instance):
+        """
+        Returns the value of the indexed instance compared in the condition
+        """
+        value = instance.get_event(self.event_type).values[self.attr_index]
+        if not self.is_left and self.condition.operand_transform is not None:
+            return self.condition.operand_transform(value)
+        return value
+
+    def get_key_dtype(self) -> np.dtype:
+        """
+        Returns the NumPy type of the keys: int64 for the keys of integer
+        attributes (unless transformed to floats), so they are compared
+        exactly as python integers, and float64 otherwise
+        """
+        attrs_types = self.event_type.attrs_types
+        key_type = attrs_types[self.attr_index] if self.attr_index < \
+            len(attrs_types) else float
+        if not self.is_left and self.condition.operand_transform is not None:
+            key_type = type(self.condition.operand_transform(key_type()))
+        return np.dtype(np.int64 if key_type is int else np.float64)
+
+    def get_probe(self, peer_instance):
+        """
+        Returns the value of the peer instance compared in the condition
+        """
+        value = peer_instance.get_event(self.other_event_type).values[
+            self.other_attr_index]
+        if self.is_left and self.condition.operand_transform is not None:
+            return self.condition.operand_transform(value)
+        return value
+
+    @abstractmethod
+    def add_instance(self, instance):
+        pass
+
+    @abstractmethod
+    def remove_instance(self, instance):
+        """
+        Removes an expired instance. The instances are removed by the order
+        of the node's list (see TreeInstanceStorage.delete_first_instances)
+        """
+        pass
+
+    @abstractmethod
+    def get_candidates(self, peer_instance) -> typing.List:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def get_column_mask(self, column: np.ndarray, probe) -> np.ndarray:
+        """
+        Returns the vectorized form of the index's predicate: which of the
+        keys in the column may satisfy the condition with the given probe
+        """
+        pass
+
+
+class HashIndex(TreeInstanceIndex):
+    """
+    An index for equality conditions (a.x = b.y) - the instances are kept in
+    buckets by the value of the attribute, so only the matching bucket is
+    probed.
+    Every bucket keeps its instances by their earliest timestamp, like the
+    node's list (see TreeInstanceStorage), so the expired instances of a
+    bucket are its head.
+    """
+    priority = 0
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.buckets = {}
+
+    def add_instance(self, instance):
+        key = self.get_key(instance)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = collections.deque([instance])
+            return
+        timestamp = instance.get_min_timestamp()
+        if bucket[-1].get_min_timestamp() <= timestamp:
+            # the common case - the instance starts after all the others
+            bucket.append(instance)
+            return
+        # after the instances starting with it, as in the node's list
+        position = len(bucket) - 1
+        while position and bucket[position - 1].get_min_timestamp() > \
+                timestamp:
+            position -= 1
+        bucket.insert(position, instance)
+
+    def remove_instance(self, instance):
+        key = self.get_key(instance)
+        bucket = self.buckets.get(key)
+        # the instances are removed by the order of the node's list
+        bucket.popleft()
+        if not bucket:
+            del self.buckets[key]
+
+    def get_candidates(self, peer_instance) -> typing.Sequence:
+        return self.buckets.get(self.get_probe(peer_instance), ())
+
+    def clear(self):
+        self.buckets = {}
+
+    def get_column_mask(self, column: np.ndarray, probe) -> np.ndarray:
+        return column == probe
+
+
+class SortedIndex(TreeInstanceIndex):
+    """
+    An index for range conditions (a.x > b.y * k + c) - the instances are
+    kept sorted by the compared value (in a sorted list of sublists, so an
+    instance is added and removed in O(log n)), and the instances satisfying
+    the bound of a peer are found with a binary search.
+    The instances of equal values are kept by the order they were added,
+    which is mostly the order they expire in, so an expired instance is
+    found at the head of the instances of its value.
+    """
+    priority = 2
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.instances = SortedKeyList(key=self.get_key)
+
+    def add_instance(self, instance):
+        self.instances.add(instance)
+
+    def remove_instance(self, instance):
+        self.instances.remove(instance)
+
+    def get_candidates(self, peer_instance) -> typing.List:
+        probe = self.get_probe(peer_instance)
+        if self.op == '>':
+            return self.instances[self.instances.bisect_key_right(probe):]
+        return self.instances[:self.instances.bisect_key_left(probe)]
+
+    def clear(self):
+        self.instances.clear()
+
+    def get_column_mask(self, column: np.ndarray, probe) -> np.ndarray:
+        if self.op == '>':
+            return column > probe
+        return column < probe
+
+
+class BandIndex(SortedIndex):
+    """
+    An index for absolute difference conditions (|a.x - b.y| <= c) - the
+    instances are kept sorted by the attribute, so the instances in the band
+    [y - c, y + c] of a peer are found with a binary search.
+    """
+    priority = 1
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.width = self.condition.free_var
+
+    def get_candidates(self, peer_instance) -> typing.List:
+        probe = self.get_probe(peer_instance)
+        instances = self.instances
+        start = instances.bisect_key_left(probe - self.width)
+        end = instances.bisect_key_right(probe + self.width)
+        # the bounds of float values are rounded differently than the
+        # difference in the condition, so they are moved to the exact bounds
+        # of the condition. the condition holds for a range of the sorted
+        # keys, so only the keys next to the bounds are checked
+        in_band = lambda i: self.condition.op_func(
+            self.get_key(instances[i]), probe)
+        while start > 0 and in_band(start - 1):
+            start -= 1
+        while start < end and not in_band(start):
+            start += 1
+        while end < len(instances) and in_band(end):
+            end += 1
+        while end > start and not in_band(end - 1):
+            end -= 1
+        return instances[start:end]
+
+    def get_column_mask(self, column: np.ndarray, probe) -> np.ndarray:
+        return np.abs(column - probe) <= self.width
+
+
+def gen_index(condition: Condition, node: Node) -> \
+        typing.Optional[TreeInstanceIndex]:
+    """
+    Creates an index over the instances of the given node for the given
+    condition of its parent, or returns None if the condition can not be
+    used for indexing
+    """
+    if not condition.user_input or len(condition) != 2 or \
+            condition.contains_kleene:
+        return None
+    node_event_types = node.get_event_types()
+    (event_type_1, event_type_2) = condition.event_types
+    if event_type_1 in node_event_types and \
+            event_type_2 not in node_event_types:
+        args = (condition, event_type_1, event_type_2)
+    elif event_type_2 in node_event_types and \
+            event_type_1 not in node_event_types:
+        args = (condition, event_type_2, event_type_1)
+    else:
+        return None
+
+    if condition.abs:
+        return BandIndex(*args)
+    if condition.op_name == '=':
+        return HashIndex(*args)
+    if condition.op_name in ['<', '>']:
+        return SortedIndex(*args)
+    return None
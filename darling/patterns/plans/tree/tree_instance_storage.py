@@ -1,60 +1,146 @@
-from patterns.plans.tree.node.node import Node
-from objects.match import Match
-import typing
-
-
-class TreeInstanceStorage:
-    """
-    This class represents the storage of all the relevant instances
-    created during the evaluation of the pattern.
-    Creation and deletion of objects is dynamic.
-    """
-
-    def __init__(self, root: Node):
-        self.root = root
-        self.node_to_instances = {}
-        for node in self.root.get_subtree_nodes_list():
-            self.node_to_instances[node] = []
-        self.size = 0
-        self.matches_latency_sum = 0
-
-    def add_instance(self, instance):
-        self.node_to_instances.get(instance.current_node).append(instance)
-        self.size += instance.size
-
-    def get_matches(self) -> typing.List[Match]:
-        matches = [i.get_match() for i in self.node_to_instances.get(self.root)]
-        # print(f'found new {len(matches)} matches!')
-        self.size -= sum([i.size for i in self.node_to_instances[self.root]])
-        self.node_to_instances[self.root] = []
-        return matches
-
-    def delete_first_instances(self, peer_node, n):
-        self.size -= sum([i.size for i in self.node_to_instances.get(peer_node)[
-                                      :n]])
-        del self.node_to_instances.get(peer_node)[:n]
-
-    def delete_instances_by_indexes(self, node, array_indexes: typing.List[
-        typing.Tuple[int, int]]):
-        expired = []
-        array = self.node_to_instances.get(node)
-        for indexes in reversed(array_indexes):
-            # deleting from biggest indexes to smaller ones
-            i, j = indexes[0], indexes[1]
-            expired.extend(array[i: j+1])
-            del self.node_to_instances.get(node)[i: j+1]
-        self.size -= sum([i.size for i in expired])
-
-    def remove_old_instances(self, timestamp: float):
-        for node in self.node_to_instances.keys():
-            node_instances = self.node_to_instances.get(node)
-            expired_instances = []
-            for instance in node_instances:
-                if instance.is_expired(timestamp):
-                    expired_instances.append(instance)
-            for expired_instance in expired_instances:
-                node_instances.remove(expired_instance)
-
-    def clean(self):
-        for node in self.node_to_instances.keys():
-            self.node_to_instances[node] = []
+import bisect
+
+from patterns.plans.tree.node.node import Node
+from objects.match import Match
+from patterns.plans.tree.tree_instance_index import TreeInstanceIndex
+import typing
+
+
+class TreeInstanceStorage:
+    """
+    This class represents the storage of all the relevant instances
+    created during the evaluation of the pattern.
+    Creation and deletion of objects is dynamic.
+    The instances of every node are kept ordered by their earliest timestamp,
+    so the expired instances of a node always form a prefix of its list.
+    A node may also have indexes over its instances (see TreeInstanceIndex),
+    which are kept in sync with its list.
+    """
+
+    def __init__(self, root: Node):
+        self.root = root
+        self.node_to_instances = {}
+        # the earliest timestamp of each instance, parallel to node_to_instances
+        self.node_to_timestamps = {}
+        self.node_to_indexes = {}
+        for node in self.root.get_subtree_nodes_list():
+            self.node_to_instances[node] = []
+            self.node_to_timestamps[node] = []
+            self.node_to_indexes[node] = []
+        self.size = 0
+        self.matches_latency_sum = 0
+
+    def _insert_instance(self, instance) -> int:
+        """
+        Inserts the instance to its node's list by its earliest timestamp and
+        returns its position in the list
+        """
+        node = instance.current_node
+        instances = self.node_to_instances.get(node)
+        timestamps = self.node_to_timestamps.get(node)
+        timestamp = instance.get_min_timestamp()
+        if not timestamps or timestamps[-1] <= timestamp:
+            # the common case - the instance starts after all the others
+            instances.append(instance)
+            timestamps.append(timestamp)
+            return len(instances) - 1
+        position = bisect.bisect_right(timestamps, timestamp)
+        instances.insert(position, instance)
+        timestamps.insert(position, timestamp)
+        return position
+
+    def add_instance(self, instance):
+        self._insert_instance(instance)
+        for index in self.node_to_indexes.get(instance.current_node):
+            index.add_instance(instance)
+        self.size += instance.size
+
+    def add_index(self, node, index: TreeInstanceIndex):
+        for instance in self.node_to_instances.get(node):
+            index.add_instance(instance)
+        indexes = self.node_to_indexes.get(node)
+        indexes.append(index)
+        # the most selective kind of index is probed
+        indexes.sort(key=lambda i: i.priority)
+
+    def get_matches(self) -> typing.List[Match]:
+        matches = [i.get_match() for i in self.node_to_instances.get(self.root)]
+        # print(f'found new {len(matches)} matches!')
+        self.size -= sum([i.size for i in self.node_to_instances[self.root]])
+        self.node_to_instances[self.root] = []
+        self.node_to_timestamps[self.root] = []
+        for index in self.node_to_indexes.get(self.root):
+            index.clear()
+        return matches
+
+    def get_first_alive_index(self, node, timestamp: float) -> int:
+        """
+        Binary searches the index of the first instance of the node that is not
+        expired with respect to the given timestamp.
+        Since the instances are ordered by their earliest timestamp, all the
+        instances before this index are expired.
+        """
+        instances = self.node_to_instances.get(node)
+        low, high = 0, len(instances)
+        while low < high:
+            mid = (low + high) // 2
+            if instances[mid].is_expired(timestamp):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def remove_expired_instances(self, node, timestamp: float) -> \
+            typing.List:
+        """
+        Drops the expired prefix of the node's instances in one step and
+        returns the remaining (alive) instances
+        """
+        n = self.get_first_alive_index(node, timestamp)
+        if n:
+            self.delete_first_instances(node, n)
+        return self.node_to_instances.get(node)
+
+    def get_peer_instances(self, peer_node, instance, timestamp: float) -> \
+            typing.List:
+        """
+        Returns the alive instances of the peer node that may create a parent
+        instance with the given instance. If the peer node has an index, only
+        the instances found by it are returned.
+        """
+        peer_instances = self.remove_expired_instances(peer_node, timestamp)
+        indexes = self.node_to_indexes.get(peer_node)
+        if not peer_instances or not indexes:
+            return peer_instances
+        return indexes[0].get_candidates(instance)
+
+    def clear_instances(self, node):
+        self.size -= sum([i.size for i in self.node_to_instances.get(node)])
+        self.node_to_instances[node] = []
+        self.node_to_timestamps[node] = []
+        for index in self.node_to_indexes.get(node):
+            index.clear()
+
+    def _remove_from_indexes(self, node, instances: typing.List):
+        for index in self.node_to_indexes.get(node):
+            for instance in instances:
+                index.remove_instance(instance)
+
+    def delete_first_instances(self, peer_node, n):
+        self.size -= sum([i.size for i in self.node_to_instances.get(peer_node)[
+                                      :n]])
+        self._remove_from_indexes(peer_node,
+                                  self.node_to_instances.get(peer_node)[:n])
+        del self.node_to_instances.get(peer_node)[:n]
+        del self.node_to_timestamps.get(peer_node)[:n]
+
+    def remove_old_instances(self, timestamp: float):
+        for node in self.node_to_instances.keys():
+            self.remove_expired_instances(node, timestamp)
+
+    def clean(self):
+        for node in self.node_to_instances.keys():
+            self.node_to_instances[node] = []
+            self.node_to_timestamps[node] = []
+            for index in self.node_to_indexes.get(node):
+                index.clear()
@@ -1,216 +1,425 @@
-import csv
-import json
-import socket
-import threading
-import time
-import typing
-import signal
-from datetime import datetime
-
-import experiments.results_consts as rc
-from experiments.configurations_map import config, boost_size, boost_peaks
-from experiments.consts import *
-from objects.match import Match
-from parsers.parser import Parser
-from patterns.plans.tree.left_deep_tree_evaluation_plan import \
-    LeftDeepTreeEvaluationPlan
-from patterns.plans.tree.tree_evaluation_mechanism import EvaluationMechanism
-
-
-class Processor:
-    def __init__(self):
-
-        self.config = config
-        self.num_events = config[TOTAL_EVENTS]
-        self.last_tp_time = None # for updating throughput
-        self.tp_events_sum, self.num_processed, self.new_shedded, \
-        self.buffer_shedded, self.not_related, self.num_overloaded = [0] * 6
-        self.num_reset = 0
-        self.throughputs = []
-        self._lock = threading.Lock()
-        self.boost = config[BOOST] # dict mapping index -> boost
-        self.allow_sleeping = config[ALLOW_SLEEPING]
-        self.parser = Parser(config[EVENT_TYPES])
-        self.types, self.pattern = self.parser.parse_pattern(config[PATTERN],
-                                                           config.get(SELECTIVITY),
-                                                           config[
-                                                                 ATTRS_DIST_PARAMS], config[ATTRS_TYPES])
-
-        self.evaluation_mechanism = EvaluationMechanism(self.pattern,
-                                                        LeftDeepTreeEvaluationPlan())
-        self.matches = 0
-        self.start_time, self.end_time, self.time_warm_up = 0, 0, 0
-
-    def _update_throughput(self, start_ts: float, end_ts: float):
-        self.tp_events_sum += 1
-        if self.last_tp_time is None:
-            self.last_tp_time = end_ts
-        timediff = end_ts - start_ts
-        if timediff >= self.throughput_delta:
-            throughput = self.tp_events_sum / timediff
-            self.throughputs.append(throughput)
-            self.last_tp_time = end_ts
-            self.tp_events_sum = 0
-
-    def _calc_selectivity(self):
-        events, result = {}, {}
-        for event_type in self.types:
-            events[event_type] = []
-        for event in self.parser.parse_event(self.data_file):
-            events.get(event.type.name).append(event)
-        for cond in self.pattern.conditions:
-            if not cond.user_input:
-                continue
-            print(cond.attr_1)
-            passed_cond = 0
-            if len(cond.event_types) == 1:
-                type_1, type_2 = cond.event_types[0].name, None
-                sum = len(events.get(type_1))
-                for event in events.get(type_1):
-                    if cond.verify(event):
-                        passed_cond += 1
-            else:
-                type_1, type_2 = cond.event_types[0].name, cond.event_types[1].name
-                sum = len(events.get(type_1)) * \
-                      len(events.get(type_2))
-                for event1 in events.get(type_1):
-                    for event2 in events.get(type_2):
-                        if cond.verify(event1, event2):
-                            passed_cond += 1
-            cond.selectivity = passed_cond / sum
-            print(f'selectivity for condition {cond.desc} is {cond.selectivity}')
-
-    def add_event(self, event_str: str, event_ws: int):
-            with self._lock:
-                event = self.parser.parse_event_from_str(event_str)
-                new_shedded, buffer_shedded =\
-                    self.evaluation_mechanism.add_event(event)
-                self.new_shedded += new_shedded
-                self.buffer_shedded += buffer_shedded
-                self.num_processed = self.num_processed + new_shedded + buffer_shedded
-
-    def add_events_route(self, msg):
-        event_str, event_ws = msg.split(SEPARATOR)
-        event_ws = int(event_ws)
-        self.add_event(event_str, event_ws)
-
-    def add_events(self):
-        server_address = ('0.0.0.0', 80)
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.bind(server_address)
-        sock.listen(1)
-
-        conn, address = sock.accept()
-        x = conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-        print(f'got connection from {str(address)}')
-        # try:
-        while True:
-            data = conn.recv(2048).decode()
-
-            if data:
-                if data == FINISH:
-                    conn.close()
-                    break
-                elif data == CHECK_FINISHED_WARM_UP:
-                    if self.num_processed == WARM_UP:
-                        conn.send(FINISHED_WARM_UP.encode())
-                        self.evaluation_mechanism.overload_detector \
-                            .warm_up_finished = True
-                        print(f'finished warm up!, matches: {self.matches}')
-                        self.time_warm_up = datetime.utcnow().timestamp()
-                    else:
-                        conn.send(NOT_FINISHED_WARM_UP.encode())
-                else:
-                    conn.send(GOT_MESSAGE.encode())
-                    self.add_events_route(data)
-
-
-    def update_results(self, result):
-        result.update({
-            rc.NEW_SHEDDED: self.new_shedded,
-            rc.BUFFER_SHEDDED: self.buffer_shedded,
-            rc.NOT_RELATED: self.not_related
-        })
-
-    def process_events(self, matches: typing.List[Match], result: typing.Dict):
-        time.sleep(5)  # waiting for starting getting events
-
-        while self.num_processed != self.num_events:
-            new_matches = self.evaluation_mechanism.process()
-            if new_matches is None:
-                continue  # there is no available event
-            self.matches += new_matches
-            with self._lock:
-                self.num_processed += 1
-
-    def write_results(self, signum=None, frame=None):
-        if signum is not None:
-            stopped = 1
-            signum = signum
-            self.end_time = datetime.utcnow().timestamp()
-        else:
-            stopped = 0
-            signum = -1
-        results = {
-            'queue_size': self.evaluation_mechanism.N_in,
-            'processing_latency': self.evaluation_mechanism.processing_latency,
-            'num_shedded': self.evaluation_mechanism.num_shedded,
-            'found_matches': self.matches,
-            'matches_latency':
-                self.evaluation_mechanism.storage.matches_latency_sum
-                / self.matches if self.matches else 0,
-            'pattern': os.environ.get('PATTERN'),
-            'lb': float(os.environ.get('L_MAX')),
-            'data': DATASET_KIND,
-            'time': self.end_time - self.start_time,
-            'time_warm_up': self.time_warm_up - self.start_time,
-            'warm_up': WARM_UP,
-            'stopped': stopped,
-            'signum': signum,
-            'pattern_len': len(self.pattern.event_types),
-            'window_time': self.pattern.time_window,
-            'sleep_reg': float(os.environ.get('SLEEP_REG')),
-            'sleep_load': float(os.environ.get('SLEEP_LOAD')),
-            'port': os.environ.get('PORT'),
-            'boost_size': boost_size,
-            'boost_peaks': boost_peaks,
-            'throughput': DATA_SIZE / (self.end_time - self.start_time),
-            'data_size': DATA_SIZE,
-            'num_processed': self.num_processed,
-            'storage_size': self.evaluation_mechanism.storage_size,
-            'storage_size_avg': self.evaluation_mechanism.total_storage_size
-                                / float(self.num_processed)
-        }
-
-        print(results)
-
-        # out_file = f'results_final/{port}.json'
-        # with open(out_file, 'w', encoding='utf-8') as f:
-        #     json.dump(results, f, ensure_ascii=False, indent=4)
-
-    def run(self) -> None:
-        print(config[PATTERN])
-        result = dict()
-        self.start_time = datetime.utcnow().timestamp()
-        matches = []
-        t2 = threading.Thread(target=self.process_events,
-                              args=(matches, result,))
-        t2.start()
-        self.add_events()
-        t2.join()
-
-        self.end_time = datetime.utcnow().timestamp()
-
-        print(f'num of matches {self.matches}')
-        self.write_results()
-        # if self.evaluation_mechanism.has_neg:
-        #     port = int(os.environ.get('PORT'))
-        #     out_file = f'results/{port}-matches.txt'
-        #     with open(out_file, 'w') as f:
-        #         f.writelines(self.evaluation_mechanism.total_matches)
-
-
-if __name__ == '__main__':
-    processor = Processor()
-    signal.signal(signal.SIGTERM, processor.write_results)
-    processor.run()
+import asyncio
+import csv
+import json
+import socket
+import threading
+import time
+import typing
+import signal
+from datetime import datetime
+
+import experiments.results_consts as rc
+from experiments.configurations_map import config, boost_size, boost_peaks
+from experiments.consts import *
+from objects.event import Event
+from objects.event_type import EventType
+from objects.match import Match
+from objects.spsc_queue import SPSCQueue
+from parsers.binary_parser import BinaryParser
+from parsers.parser import Parser
+from protocol import *
+from patterns.plans.tree.left_deep_tree_evaluation_plan import \
+    LeftDeepTreeEvaluationPlan
+from patterns.plans.tree.tree_evaluation_mechanism import EvaluationMechanism
+
+
+class Source:
+    """
+    A connected generator. The credit of its events is returned by the
+    processing thread once it consumes them from the ingest queue, so the
+    events in flight (in the socket and in the ingest queue) are bounded by
+    EVENTS_CREDIT
+    """
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        # the timestamp the next events of the generator are not earlier
+        # than, maintained by the processing thread (see Processor.watermark)
+        self.watermark = None
+
+    def _write_credit(self, credit: int):
+        if not self.writer.is_closing():
+            self.writer.write(encode_credit(credit))
+
+    def return_credit(self, credit: int):
+        """
+        Sends credit to the generator, from any thread
+        """
+        if self.closed:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._write_credit, credit)
+        except RuntimeError:
+            # the event loop was closed after the connection
+            pass
+
+
+class SourceMark:
+    """
+    Follows the events of a frame of a source in the ingest queue. It may
+    also carry a watermark of the source, or mark that the source finished
+    """
+    __slots__ = ['source', 'credit', 'watermark', 'finished']
+
+    def __init__(self, source: Source, credit: int, watermark=None,
+                 finished: bool = False):
+        self.source = source
+        self.credit = credit
+        self.watermark = watermark
+        self.finished = finished
+
+
+class Processor:
+    def __init__(self):
+
+        self.config = config
+        self.num_events = config[TOTAL_EVENTS]
+        self.last_tp_time = None # for updating throughput
+        self.tp_events_sum, self.num_processed, self.new_shedded, \
+        self.buffer_shedded, self.not_related, self.num_overloaded = [0] * 6
+        self.num_reset = 0
+        self.throughputs = []
+        # the received events are handed from the socket thread to the
+        # processing thread, which is the only one touching the evaluation
+        # mechanism's buffers. It holds the credit of events of every source
+        # and a mark per frame of them. The watermarks are not credited, so a
+        # source may still find it full (see wait_for_room)
+        self.ingest_queue = SPSCQueue(2 * NUM_SOURCES * (EVENTS_CREDIT + 1))
+        # the sources the processing thread got events from and did not
+        # finish, the number of the finished ones, and the timestamp of the
+        # last event consumed since the last mark
+        self.live_sources = set()
+        self.num_finished_sources = 0
+        self.last_timestamp = None
+        self.boost = config[BOOST] # dict mapping index -> boost
+        self.allow_sleeping = config[ALLOW_SLEEPING]
+        self.parser = Parser(config[EVENT_TYPES])
+        self.types, self.pattern = self.parser.parse_pattern(config[PATTERN],
+                                                           config.get(SELECTIVITY),
+                                                           config[
+                                                                 ATTRS_DIST_PARAMS], config[ATTRS_TYPES])
+
+        self.binary_parser = BinaryParser(self.parser.type_name_to_obj)
+        self.evaluation_mechanism = EvaluationMechanism(self.pattern,
+                                                        LeftDeepTreeEvaluationPlan())
+        self.matches = 0
+        self.start_time, self.end_time, self.time_warm_up = 0, 0, 0
+
+    def _update_throughput(self, start_ts: float, end_ts: float):
+        self.tp_events_sum += 1
+        if self.last_tp_time is None:
+            self.last_tp_time = end_ts
+        timediff = end_ts - start_ts
+        if timediff >= self.throughput_delta:
+            throughput = self.tp_events_sum / timediff
+            self.throughputs.append(throughput)
+            self.last_tp_time = end_ts
+            self.tp_events_sum = 0
+
+    def _calc_selectivity(self):
+        events, result = {}, {}
+        for event_type in self.types:
+            events[event_type] = []
+        for event in self.parser.parse_event(self.data_file, WITH_WS):
+            events.get(event.type.name).append(event)
+        for cond in self.pattern.conditions:
+            if not cond.user_input:
+                continue
+            print(cond.attr_1)
+            passed_cond = 0
+            if len(cond.event_types) == 1:
+                type_1, type_2 = cond.event_types[0].name, None
+                sum = len(events.get(type_1))
+                for event in events.get(type_1):
+                    if cond.verify(event):
+                        passed_cond += 1
+            else:
+                type_1, type_2 = cond.event_types[0].name, cond.event_types[1].name
+                sum = len(events.get(type_1)) * \
+                      len(events.get(type_2))
+                for event1 in events.get(type_1):
+                    for event2 in events.get(type_2):
+                        if cond.verify(event1, event2):
+                            passed_cond += 1
+            cond.selectivity = passed_cond / sum
+            print(f'selectivity for condition {cond.desc} is {cond.selectivity}')
+
+    def add_event(self, event_type: EventType, values: typing.Sequence,
+                  utility: int = None):
+        """
+        Adds a received event by its decoded attributes values (and its
+        utility, if it was already computed). The event is created by the
+        processing thread, only if it is not shedded (see buffer_events)
+        """
+        utility = self.evaluation_mechanism.values_arrived(event_type, values,
+                                                           utility)
+        self.ingest_queue.put((event_type, values, utility,
+                               datetime.utcnow().timestamp()))
+
+    def buffer_events(self):
+        """
+        Moves all the received events to the leaf buffers of the evaluation
+        mechanism (shedding them if needed). The events are created here,
+        unless they are shedded first
+        """
+        for event in self.ingest_queue.drain():
+            if isinstance(event, SourceMark):
+                self.consume_mark(event)
+                continue
+            event_type, values, utility, system_ts = event
+            if self.evaluation_mechanism.shed_arriving_event(event_type,
+                                                             utility):
+                # it was shedded before it was created
+                new_shedded, buffer_shedded = 1, 0
+            else:
+                event = Event(event_type, values, converted=True)
+                event.utility = utility
+                event.system_ts_in_adding = system_ts
+                self.last_timestamp = event.get_timestamp()
+                new_shedded, buffer_shedded = \
+                    self.evaluation_mechanism.buffer_event(event)
+            self.new_shedded += new_shedded
+            self.buffer_shedded += buffer_shedded
+            self.num_processed = self.num_processed + new_shedded + \
+                                 buffer_shedded
+        if NUM_SOURCES > 1:
+            self.evaluation_mechanism.watermark = self.watermark
+
+    def consume_mark(self, mark: SourceMark):
+        source = mark.source
+        if mark.credit:
+            # the events of the source's frame were consumed
+            source.return_credit(mark.credit)
+        if mark.finished:
+            self.live_sources.discard(source)
+            self.num_finished_sources += 1
+            return
+        self.live_sources.add(source)
+        # the events of every source are sent by their timestamps, and the
+        # events between two marks are of the same frame
+        for timestamp in [self.last_timestamp, mark.watermark]:
+            if timestamp is not None and (source.watermark is None or
+                                          timestamp > source.watermark):
+                source.watermark = timestamp
+        self.last_timestamp = None
+
+    @property
+    def watermark(self):
+        """
+        The timestamp all the sources have passed, so the events up to it can
+        be processed by their timestamps although the sources are merged by
+        their arrival: the minimal watermark of the live sources, -inf while
+        some of the sources did not send events yet, and None (no bound) once
+        all of them finished
+        """
+        if len(self.live_sources) + self.num_finished_sources < NUM_SOURCES:
+            return float('-inf')
+        if not self.live_sources:
+            return None
+        watermarks = [source.watermark for source in self.live_sources]
+        return float('-inf') if None in watermarks else min(watermarks)
+
+    def add_events_route(self, msg):
+        # the window size of the event (after the separator) is not used
+        event_str = msg.split(SEPARATOR)[0]
+        self.add_event(*self.parser.parse_values_from_str(event_str))
+
+    def add_binary_events(self, payload: bytes):
+        """
+        Adds a batch of binary records. The records are decoded once, as
+        columns: the utilities of all the events are computed at once from
+        them, and the values of every event are taken from them
+        """
+        type_indexes, columns = self.binary_parser.parse_columns(payload)
+        utilities = self.evaluation_mechanism.get_batch_utilities(
+            self.binary_parser.types, type_indexes, columns)
+        for (event_type, values), utility in zip(
+                self.binary_parser.get_values(type_indexes, columns),
+                utilities.tolist()):
+            self.add_event(event_type, values, utility)
+
+    def handle_control(self, writer: asyncio.StreamWriter, msg: str) -> bool:
+        """
+        Handles a control message from a generator, and returns whether to
+        keep receiving its events
+        """
+        if msg == FINISH:
+            return False
+        if msg == CHECK_FINISHED_WARM_UP:
+            overload_detector = self.evaluation_mechanism.overload_detector
+            # the other generators may already continue after the warm up
+            if not overload_detector.warm_up_finished and \
+                    self.num_processed == WARM_UP:
+                overload_detector.warm_up_finished = True
+                print(f'finished warm up!, matches: {self.matches}')
+                self.time_warm_up = datetime.utcnow().timestamp()
+            writer.write(encode_control(
+                FINISHED_WARM_UP if overload_detector.warm_up_finished else
+                NOT_FINISHED_WARM_UP))
+        return True
+
+    async def wait_for_room(self, size: int):
+        """
+        Waits until the ingest queue has room for the given number of items,
+        so putting them does not block the event loop (and the other sources
+        with it)
+        """
+        while self.ingest_queue.get_room() < size:
+            await asyncio.sleep(INGEST_ROOM_POLL_SEC)
+
+    async def receive_events(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        """
+        Receives the events of a single generator. The events of every
+        generator are added in the order they were sent
+        """
+        conn = writer.get_extra_info('socket')
+        x = conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        print(f'got connection from {str(writer.get_extra_info("peername"))}')
+        source = Source(writer)
+        try:
+            # the generator may send that many events before they are consumed
+            writer.write(encode_credit(EVENTS_CREDIT))
+            while True:
+                frame = await read_frame_async(reader)
+                if frame is None:
+                    break
+                frame_type, payload = frame
+                if frame_type == EVENTS_FRAME:
+                    events = decode_events(payload)
+                    # the events and their mark
+                    await self.wait_for_room(len(events) + 1)
+                    for msg in events:
+                        self.add_events_route(msg)
+                    self.ingest_queue.put(SourceMark(source, len(events)))
+                elif frame_type == BINARY_EVENTS_FRAME:
+                    num_events = self.binary_parser.get_num_events(payload)
+                    await self.wait_for_room(num_events + 1)
+                    self.add_binary_events(payload)
+                    self.ingest_queue.put(SourceMark(source, num_events))
+                elif frame_type == WATERMARK_FRAME:
+                    await self.wait_for_room(1)
+                    self.ingest_queue.put(SourceMark(
+                        source, 0, decode_watermark(payload)))
+                elif frame_type == CONTROL_FRAME and not self.handle_control(
+                        writer, decode_control(payload)):
+                    break
+                await writer.drain()
+        finally:
+            source.closed = True
+            await self.wait_for_room(1)
+            self.ingest_queue.put(SourceMark(source, 0, finished=True))
+            writer.close()
+            self.num_sources_left -= 1
+            if not self.num_sources_left:
+                self.sources_finished.set()
+
+    async def serve_events(self):
+        self.num_sources_left = NUM_SOURCES
+        self.sources_finished = asyncio.Event()
+        server = await asyncio.start_server(self.receive_events, '0.0.0.0', 80)
+        async with server:
+            await self.sources_finished.wait()
+
+    def add_events(self):
+        # the generators are served concurrently by one event loop, so the
+        # events are still handed to the processing thread by a single thread
+        try:
+            asyncio.run(self.serve_events())
+        finally:
+            self.ingest_queue.close()
+
+    def update_results(self, result):
+        result.update({
+            rc.NEW_SHEDDED: self.new_shedded,
+            rc.BUFFER_SHEDDED: self.buffer_shedded,
+            rc.NOT_RELATED: self.not_related
+        })
+
+    def process_events(self, matches: typing.List[Match], result: typing.Dict):
+        time.sleep(5)  # waiting for starting getting events
+
+        while self.num_processed != self.num_events:
+            self.buffer_events()
+            new_matches = self.evaluation_mechanism.process()
+            if new_matches is None:
+                # there is no available event
+                if self.ingest_queue.closed and not self.ingest_queue:
+                    break
+                self.ingest_queue.wait()
+                continue
+            self.matches += new_matches
+            self.num_processed += 1
+
+    def write_results(self, signum=None, frame=None):
+        if signum is not None:
+            stopped = 1
+            signum = signum
+            self.end_time = datetime.utcnow().timestamp()
+        else:
+            stopped = 0
+            signum = -1
+        results = {
+            'queue_size': self.evaluation_mechanism.N_in,
+            'processing_latency': self.evaluation_mechanism.processing_latency,
+            'num_shedded': self.evaluation_mechanism.num_shedded,
+            'found_matches': self.matches,
+            'matches_latency':
+                self.evaluation_mechanism.storage.matches_latency_sum
+                / self.matches if self.matches else 0,
+            'pattern': os.environ.get('PATTERN'),
+            'lb': float(os.environ.get('L_MAX')),
+            'data': DATASET_KIND,
+            'time': self.end_time - self.start_time,
+            'time_warm_up': self.time_warm_up - self.start_time,
+            'warm_up': WARM_UP,
+            'stopped': stopped,
+            'signum': signum,
+            'pattern_len': len(self.pattern.event_types),
+            'window_time': self.pattern.time_window,
+            'sleep_reg': float(os.environ.get('SLEEP_REG')),
+            'sleep_load': float(os.environ.get('SLEEP_LOAD')),
+            'port': os.environ.get('PORT'),
+            'boost_size': boost_size,
+            'boost_peaks': boost_peaks,
+            'throughput': DATA_SIZE / (self.end_time - self.start_time),
+            'data_size': DATA_SIZE,
+            'num_processed': self.num_processed,
+            'storage_size': self.evaluation_mechanism.storage_size,
+            'storage_size_avg': self.evaluation_mechanism.total_storage_size
+                                / float(self.num_processed)
+        }
+
+        print(results)
+
+        # out_file = f'results_final/{port}.json'
+        # with open(out_file, 'w', encoding='utf-8') as f:
+        #     json.dump(results, f, ensure_ascii=False, indent=4)
+
+    def run(self) -> None:
+        print(config[PATTERN])
+        result = dict()
+        self.start_time = datetime.utcnow().timestamp()
+        matches = []
+        t2 = threading.Thread(target=self.process_events,
+                              args=(matches, result,))
+        t2.start()
+        self.add_events()
+        t2.join()
+
+        self.end_time = datetime.utcnow().timestamp()
+
+        print(f'num of matches {self.matches}')
+        self.write_results()
+        # if self.evaluation_mechanism.has_neg:
+        #     port = int(os.environ.get('PORT'))
+        #     out_file = f'results/{port}-matches.txt'
+        #     with open(out_file, 'w') as f:
+        #         f.writelines(self.evaluation_mechanism.total_matches)
+
+
+if __name__ == '__main__':
+    processor = Processor()
+    signal.signal(signal.SIGTERM, processor.write_results)
+    processor.run()
@@ -1,133 +1,163 @@
-import socket
-import time
-
-import requests
-
-from experiments.configurations_map import config
-from experiments.consts import *
-from parsers.parser import Parser
-
-
-class EventsGenerator:
-    def __init__(self, allow_sleeping=True):
-        self.boost = self.get_boost(config[BOOST])
-        self.allow_sleeping = allow_sleeping
-        self.random_indexes = list(self.boost.keys())
-        self.session = requests.Session()
-        self.sleep_reg = float(os.getenv('SLEEP_REG'))
-        self.sleep_load = float(os.getenv('SLEEP_LOAD'))
-        self.config = config
-        self.parser = Parser(self.config[EVENT_TYPES])
-        self.types, self.pattern = self.parser.parse_pattern(self.config[PATTERN],
-                                                             self.config.get(SELECTIVITY),
-                                                             self.config[
-                                                                 ATTRS_DIST_PARAMS],
-                                                             self.config[
-                                                                 ATTRS_TYPES])
-        filename, self.types_names = Parser.get_data_filename(DATASET_KIND,
-                                                              config[PATTERN],
-                                                              True)
-        print(self.types_names)
-        self.file = f'{ORIGIN_DATA_DIR}/{filename}'
-
-    def get_boost(self, boost_percents):
-        """
-        Creates boost in indexes from boost given in percents
-        """
-        new_boost = {}
-        for (index, val) in boost_percents.items():
-            new_index = int(DATA_SIZE * index / 100)
-            new_val = int(DATA_SIZE * val / 100)
-            new_boost[new_index] = new_val
-        print(f'boost:\n{new_boost}')
-        return new_boost
-
-    def check_warm_up_state(self, client_socket) -> bool:
-        client_socket.send(CHECK_FINISHED_WARM_UP.encode())
-        ack = client_socket.recv(1024).decode()
-        if ack == FINISHED_WARM_UP:
-            return True
-        elif ack == NOT_FINISHED_WARM_UP:
-            return False
-        else:
-            print(f'wrong return value for check finished warm up! {ack}')
-            return False
-
-    def send_events(self, time_diffs_file: str = None):
-        client_socket = socket.socket()  # instantiate
-        client_socket.connect((IP, PORT))  # connect to the server
-        x = client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-        finished_warm_up = False
-        sleep = False
-        boost_count = None
-        print(f'warm up size: {WARM_UP}')
-        time_diffs = []
-        if time_diffs_file is not None:
-            with open(time_diffs_file, 'r') as t:
-                for l in t:
-                    time_diffs.append(float(l.rstrip()))
-        try:
-            with open(self.file, 'r') as f:
-                for i, line in enumerate(f):
-                    if i == DATA_SIZE:
-                        break
-                    if i % 1000 == 0:
-                        print(f'added {i} events')
-                    if line.split(',')[0] not in self.types_names:
-                        continue
-                    if i == WARM_UP:
-                        sleep = True
-                        while not finished_warm_up:
-                            finished_warm_up = self.check_warm_up_state(
-                                client_socket)
-                            if not finished_warm_up:
-                                time.sleep(SLEEP_WARM_UP_SEC)
-                    if sleep:
-                        time_sleep = 0 if time_diffs_file is None else \
-                            time_diffs[i]
-                        if i in self.random_indexes:
-                            boost_count = self.boost[i]
-                            self.random_indexes.remove(i)
-                        if not boost_count:
-                            time.sleep(self.sleep_reg + time_sleep)
-                        else:
-                            time.sleep(self.sleep_load + time_sleep)
-                            boost_count -= 1
-                    line = line.strip('\n')
-                    splitted_line = line.split(',')
-                    if os.environ.get('WS', None) is not None:
-                        event, ws = ','.join(splitted_line[:-1]), splitted_line[
-                            -1]
-                    else:
-                        event, ws = ','.join(splitted_line), '0'
-                    payload = f'{event}{SEPARATOR}{ws}'.encode()
-                    sent = False
-                    while not sent:
-                        try:
-                            client_socket.send(payload)
-                            ack = client_socket.recv(1024).decode()
-                            if ack == GOT_MESSAGE:
-                                sent = True
-                        except socket.error:
-                            # set connection status and recreate socket
-                            connected = False
-                            client_socket = socket.socket()
-                            print("connection lost... reconnecting")
-                            while not connected:
-                                # attempt to reconnect, otherwise sleep for 2 seconds
-                                try:
-                                    client_socket.connect((IP, PORT))
-                                    connected = True
-                                    print("re-connection successful")
-                                except socket.error:
-                                    sleep(2)
-
-            client_socket.send(FINISH.encode())
-        finally:
-            client_socket.close()
-
-
-if __name__ == '__main__':
-    time.sleep(5)  # sleeping until the server up
-    time_diffs_file = os.environ.get('ARRIVAL_RATES', None)
+import json
+import socket
+import time
+import typing
+
+import requests
+
+from experiments.configurations_map import config
+from experiments.consts import *
+from load_profile import ConstantProfile, LoadProfile, PeaksProfile, \
+    SumProfile, TraceProfile, get_boost, get_send_times, parse_load_profile
+from parsers.parser import Parser
+from protocol import *
+from replay_scheduler import ReplayScheduler
+
+
+class EventsGenerator:
+    def __init__(self, allow_sleeping=True):
+        self.boost = self.get_boost(config[BOOST])
+        self.allow_sleeping = allow_sleeping
+        self.session = requests.Session()
+        self.sleep_reg = 1 / TARGET_RATE if TARGET_RATE else \
+            float(os.getenv('SLEEP_REG'))
+        self.sleep_load = float(os.getenv('SLEEP_LOAD'))
+        self.config = config
+        self.parser = Parser(self.config[EVENT_TYPES])
+        self.types, self.pattern = self.parser.parse_pattern(self.config[PATTERN],
+                                                             self.config.get(SELECTIVITY),
+                                                             self.config[
+                                                                 ATTRS_DIST_PARAMS],
+                                                             self.config[
+                                                                 ATTRS_TYPES])
+        filename, self.types_names = Parser.get_data_filename(DATASET_KIND,
+                                                              config[PATTERN],
+                                                              True)
+        print(self.types_names)
+        self.file = f'{ORIGIN_DATA_DIR}/{filename}'
+
+    def get_boost(self, boost_percents):
+        """
+        Creates boost in indexes from boost given in percents
+        """
+        new_boost = get_boost(boost_percents, DATA_SIZE)
+        print(f'boost:\n{new_boost}')
+        return new_boost
+
+    def get_load_profile(self, time_diffs_file: str = None) -> LoadProfile:
+        """
+        Returns the load profile declared in the LOAD_PROFILE file, or else the
+        profile of sleeping SLEEP_LOAD in the BOOST peaks and SLEEP_REG (or by
+        TARGET_RATE) otherwise, plus the ARRIVAL_RATES gaps
+        """
+        if LOAD_PROFILE is not None:
+            with open(LOAD_PROFILE) as f:
+                return parse_load_profile(json.load(f))
+        profile = PeaksProfile(ConstantProfile(self.sleep_reg),
+                               ConstantProfile(self.sleep_load),
+                               self.config[BOOST])
+        if time_diffs_file is not None:
+            profile = SumProfile([profile, TraceProfile(time_diffs_file)])
+        return profile
+
+    def receive_frame(self, frame_type: int) -> bytes:
+        """
+        Reads frames from the processor until a frame of the given type, and
+        returns its payload. The credits received meanwhile are accumulated
+        """
+        while True:
+            received_type, payload = self.reader.read_frame()
+            if received_type == CREDIT_FRAME:
+                self.credit += decode_credit(payload)
+            if received_type == frame_type:
+                return payload
+
+    def send_batch(self, client_socket, batch: typing.List[str]):
+        """
+        Sends the batched events, in frames of at most the available credit
+        (waiting for credit from the processor), and empties the batch
+        """
+        while batch:
+            while not self.credit:
+                self.receive_frame(CREDIT_FRAME)
+            size = min(self.credit, len(batch))
+            send_events(client_socket, batch[:size])
+            self.credit -= size
+            del batch[:size]
+
+    def check_warm_up_state(self, client_socket) -> bool:
+        send_control(client_socket, CHECK_FINISHED_WARM_UP)
+        ack = decode_control(self.receive_frame(CONTROL_FRAME))
+        if ack == FINISHED_WARM_UP:
+            return True
+        elif ack == NOT_FINISHED_WARM_UP:
+            return False
+        else:
+            print(f'wrong return value for check finished warm up! {ack}')
+            return False
+
+    def send_events(self, time_diffs_file: str = None):
+        client_socket = socket.socket()  # instantiate
+        client_socket.connect((IP, PORT))  # connect to the server
+        x = client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.reader = FrameReader(client_socket)
+        # the number of events the processor lets us send
+        self.credit = 0
+        batch = []
+        # the send times of the events after the warm up are precomputed
+        send_times = get_send_times(
+            self.get_load_profile(time_diffs_file), DATA_SIZE, WARM_UP)
+        scheduler = ReplayScheduler(send_times, REPLAY_SPIN_SEC)
+        with_ws = os.environ.get('WS', None) is not None
+        finished_warm_up = False
+        sleep = False
+        print(f'warm up size: {WARM_UP}')
+        try:
+            with open(self.file, 'r') as f:
+                for i, line in enumerate(f):
+                    if i == DATA_SIZE:
+                        break
+                    if i % 1000 == 0:
+                        print(f'added {i} events')
+                    if line.split(',')[0] not in self.types_names:
+                        continue
+                    if i == WARM_UP:
+                        self.send_batch(client_socket, batch)
+                        sleep = True
+                        while not finished_warm_up:
+                            finished_warm_up = self.check_warm_up_state(
+                                client_socket)
+                            if not finished_warm_up:
+                                time.sleep(SLEEP_WARM_UP_SEC)
+                        # the events after the warm up are paced from now on
+                        scheduler.start()
+                    if sleep and not scheduler.is_due(i - WARM_UP):
+                        # the due events are sent before waiting, so no
+                        # event is delayed by the batching
+                        self.send_batch(client_socket, batch)
+                        scheduler.wait()
+                    line = line.strip('\n')
+                    splitted_line = line.split(',')
+                    if with_ws:
+                        event, ws = ','.join(splitted_line[:-1]), splitted_line[
+                            -1]
+                    else:
+                        event, ws = ','.join(splitted_line), '0'
+                    batch.append(f'{event}{SEPARATOR}{ws}')
+                    if len(batch) == EVENTS_BATCH_SIZE:
+                        self.send_batch(client_socket, batch)
+
+            self.send_batch(client_socket, batch)
+            send_control(client_socket, FINISH)
+            # waiting for the processor to close the connection, so no frame
+            # is dropped by closing it while the processor still sends credit
+            while self.reader.read_frame() is not None:
+                continue
+        finally:
+            client_socket.close()
+
+
+if __name__ == '__main__':
+    time.sleep(5)  # sleeping until the server up
+    time_diffs_file = os.environ.get('ARRIVAL_RATES', None)
     EventsGenerator().send_events(time_diffs_file)
\ No newline at end of file
@@ -1,7 +1,7 @@
-from abc import ABC, abstractmethod
-
-
-class Plan:
-    @abstractmethod
-    def _build_plan_from_spec(self, spec: str):
-        pass
+from abc import ABC, abstractmethod
+
+
+class Plan:
+    @abstractmethod
+    def _build_plan_from_spec(self, spec: str):
+        pass
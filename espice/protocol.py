@@ -0,0 +1,79 @@
+import socket
+import struct
+import typing
+
+# every frame starts with a header of its type and the length of its payload
+FRAME_HEADER = struct.Struct('!BI')
+EVENTS_FRAME = 1  # payload: a batch of events, one per line
+CONTROL_FRAME = 2  # payload: a control message (e.g. FINISH)
+CREDIT_FRAME = 3  # payload: the number of events the sender may send more
+CREDIT = struct.Struct('!I')
+RECV_SIZE = 2 ** 16
+
+
+def encode_frame(frame_type: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
+def encode_events(events: typing.List[str]) -> bytes:
+    return encode_frame(EVENTS_FRAME, '\n'.join(events).encode())
+
+
+def encode_control(msg: str) -> bytes:
+    return encode_frame(CONTROL_FRAME, msg.encode())
+
+
+def encode_credit(credit: int) -> bytes:
+    return encode_frame(CREDIT_FRAME, CREDIT.pack(credit))
+
+
+def send_events(sock: socket.socket, events: typing.List[str]):
+    sock.sendall(encode_events(events))
+
+
+def send_control(sock: socket.socket, msg: str):
+    sock.sendall(encode_control(msg))
+
+
+def send_credit(sock: socket.socket, credit: int):
+    sock.sendall(encode_credit(credit))
+
+
+def decode_events(payload: bytes) -> typing.List[str]:
+    return payload.decode().split('\n')
+
+
+def decode_control(payload: bytes) -> str:
+    return payload.decode()
+
+
+def decode_credit(payload: bytes) -> int:
+    return CREDIT.unpack(payload)[0]
+
+
+class FrameReader:
+    """
+    This class reads whole frames from a socket, no matter how the stream is
+    split or merged by the socket reads
+    """
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = bytearray()
+
+    def read_frame(self) -> typing.Optional[typing.Tuple[int, bytes]]:
+        """
+        Returns the next frame as (type, payload), or None if the connection
+        was closed
+        """
+        while True:
+            if len(self.buffer) >= FRAME_HEADER.size:
+                frame_type, length = FRAME_HEADER.unpack_from(self.buffer)
+                end = FRAME_HEADER.size + length
+                if len(self.buffer) >= end:
+                    payload = bytes(self.buffer[FRAME_HEADER.size:end])
+                    del self.buffer[:end]
+                    return frame_type, payload
+            data = self.sock.recv(RECV_SIZE)
+            if not data:
+                return None
+            self.buffer += data
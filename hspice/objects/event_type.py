@@ -1,32 +1,54 @@
-import typing
-from experiments.consts import *
-from operator import add
-from objects.event import Event
-
-
-class EventType:
-    def __init__(self, name: str, attrs_names: typing.List[str],
-                 attrs_dist_params: typing.Dict[str, typing.List[float]],
-                 attrs_types: typing.Dict):
-        self.name = name
-        self.attrs_names = attrs_names
-        self.attrs_types = attrs_types
-        self.attrs_avgs = [attrs_dist_params.get(a)[0] for a in attrs_names[1:]]
-        self.update_after = UPDATE_RATE
-        self.attrs_sum = [0] * (len(attrs_names) - 1) # without time
-        self.curr_num = 0
-        self.event_name_generator = self.gen_event_name()
-        self.size = len(self.attrs_names)
-        self.attrs_dist_params = attrs_dist_params
-
-    def is_valid_attrs(self, attrs: typing.List[str]) -> int:
-        return len(self.attrs_names) == len(attrs)
-
-    def gen_event_name(self) -> str:
-        i = 1
-        while True:
-            yield f'{self.name}_{i}'
-            i += 1
-
-    def __str__(self):
-        return f'{self.name}{self.attrs_names}'
+import typing
+from experiments.consts import *
+from patterns.consts import TIME_KEY
+from operator import add
+from objects.event import Event
+
+
+class EventType:
+    def __init__(self, name: str, attrs_names: typing.List[str],
+                 attrs_dist_params: typing.Dict[str, typing.List[float]],
+                 attrs_types: typing.Dict):
+        self.name = name
+        self.attrs_names = attrs_names
+        self.attrs_types = attrs_types
+        self.attrs_avgs = [attrs_dist_params.get(a)[0] for a in attrs_names[1:]]
+        self.update_after = UPDATE_RATE
+        self.attrs_sum = [0] * (len(attrs_names) - 1) # without time
+        self.curr_num = 0
+        self.event_name_generator = self.gen_event_name()
+        self.size = len(self.attrs_names)
+        self.attrs_dist_params = attrs_dist_params
+        # the (index, type) of the attributes converted when parsing an event
+        self.decoded_attrs = list(enumerate(self.attrs_types))
+
+    def set_used_attrs(self, used_attrs: typing.Set[str]):
+        """
+        Projects the parsing of the events of this type to the given
+        attributes and the time. The other attributes are not converted, and
+        their values in the events are None.
+        """
+        used_attrs = set(used_attrs) | {TIME_KEY}
+        self.decoded_attrs = [(i, attr_type) for i, (attr_name, attr_type) in
+                              enumerate(zip(self.attrs_names,
+                                            self.attrs_types))
+                              if attr_name in used_attrs]
+
+    def decode_attrs(self, attrs_values: typing.List[str]) -> typing.List:
+        values = [None] * self.size
+        for i, attr_type in self.decoded_attrs:
+            value = attrs_values[i]
+            values[i] = attr_type(value) if value else 0.0
+        return values
+
+    def is_valid_attrs(self, attrs: typing.List[str]) -> int:
+        return len(self.attrs_names) == len(attrs)
+
+    def gen_event_name(self) -> str:
+        i = 1
+        while True:
+            yield f'{self.name}_{i}'
+            i += 1
+
+    def __str__(self):
+        return f'{self.name}{self.attrs_names}'
@@ -1,40 +1,66 @@
-from enum import Enum, auto
-from patterns.consts import TIME_KEY
-import typing
-
-class Operator(Enum):
-    SEQ = 'SEQ'
-    NEG = 'NEG'
-    AND = 'AND'
-    OR = 'OR'
-    KLEENE = 'KLEENE'
-
-
-OPERATORS = {
-    'SEQ': (Operator.SEQ, lambda x, y: x < y),
-    'NEG': (Operator.NEG, lambda x: not x),
-    'AND': (Operator.AND, lambda x, y: x and y),
-    'OR': (Operator.OR, lambda x, y: x or y),
-    'KLEENE': (Operator.KLEENE, None)
-}
-
-
-def gen_abs_oprator(c: int) -> typing.Callable:
-    return lambda x, y: abs(x - y) <= c
-
-
-def gen_condition_operator(op: str, double_by=None, free_var_op=None,
-                           free_var=None) -> \
-        typing.Callable:
-        if op == '=':
-            op = '=='
-        if double_by is None and free_var_op is None:
-            return lambda x,y: eval(f'{x} {op} {y}')
-        elif double_by is not None and free_var_op is None:
-            return lambda x,y: eval(f'{x} {op} ({y} * {double_by})')
-        elif double_by is not None and free_var_op is not None:
-            return lambda x,y: eval(f'{x} {op} ({y} * {double_by} '
-                                    f'{free_var_op} {free_var})')
-        elif double_by is None and free_var_op is not None:
-            return lambda x, y: eval(f'{x} {op} {y} '
-                                     f'{free_var_op} {free_var}')
\ No newline at end of file
+from enum import Enum, auto
+from patterns.consts import TIME_KEY
+import ast
+import operator
+import typing
+
+class Operator(Enum):
+    SEQ = 'SEQ'
+    NEG = 'NEG'
+    AND = 'AND'
+    OR = 'OR'
+    KLEENE = 'KLEENE'
+
+
+OPERATORS = {
+    'SEQ': (Operator.SEQ, lambda x, y: x < y),
+    'NEG': (Operator.NEG, lambda x: not x),
+    'AND': (Operator.AND, lambda x, y: x and y),
+    'OR': (Operator.OR, lambda x, y: x or y),
+    'KLEENE': (Operator.KLEENE, None)
+}
+
+
+def gen_operand_transform(double_by=None, free_var_op=None,
+                          free_var=None) -> typing.Optional[typing.Callable]:
+    """
+    Returns the transformation a condition applies to its right operand
+    (y * double_by +/- free_var), or None if it compares the raw value.
+    The constants are parsed as python literals, so the result is the same
+    as in the condition operator.
+    """
+    if double_by is None and free_var_op is None:
+        return None
+    if free_var_op is None:
+        double_by = ast.literal_eval(double_by)
+        return lambda y: y * double_by
+    free_var_func = operator.add if free_var_op == '+' else operator.sub
+    free_var = ast.literal_eval(free_var)
+    if double_by is None:
+        return lambda y: free_var_func(y, free_var)
+    double_by = ast.literal_eval(double_by)
+    return lambda y: free_var_func(y * double_by, free_var)
+
+
+def gen_abs_oprator(c: int) -> typing.Callable:
+    return lambda x, y: abs(x - y) <= c
+
+COMPARISON_OPERATORS = {
+    '<': operator.lt,
+    '>': operator.gt,
+    '=': operator.eq
+}
+
+
+def gen_condition_operator(op: str, double_by=None, free_var_op=None,
+                           free_var=None) -> \
+        typing.Callable:
+    """
+    Compiles the comparison of a condition into a function once, when the
+    pattern is parsed, instead of evaluating its source on every comparison
+    """
+    compare = COMPARISON_OPERATORS.get(op)
+    transform = gen_operand_transform(double_by, free_var_op, free_var)
+    if transform is None:
+        return compare
+    return lambda x, y: compare(x, transform(y))
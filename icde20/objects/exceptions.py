@@ -1,6 +1,6 @@
-class InvalidAttribute(Exception):
-    pass
-
-
-class TooMuchEventsToProcess(Exception):
+class InvalidAttribute(Exception):
+    pass
+
+
+class TooMuchEventsToProcess(Exception):
     pass
\ No newline at end of file
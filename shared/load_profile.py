@@ -0,0 +1,250 @@
+"""
+Load profiles of the generators of all the engines: every profile gives the
+gaps (in seconds) before the events, from which their send times are
+precomputed (see get_send_times). Profiles are declared in JSON (see
+parse_load_profile), e.g. a Poisson process whose rate ramps up:
+    {"kind": "poisson", "profile":
+        {"kind": "ramp", "from_rate": 1000, "to_rate": 20000}}
+"""
+from abc import ABC, abstractmethod
+import typing
+
+import numpy as np
+
+
+def get_boost(boost_percents: typing.Dict[int, int], size: int) -> \
+        typing.Dict[int, int]:
+    """
+    Converts peaks given in percents of the lines (start: length) to lines
+    indexes
+    """
+    return {int(size * int(index) / 100): int(size * val / 100) for
+            index, val in boost_percents.items()}
+
+
+class LoadProfile(ABC):
+    """
+    The base class of the load profiles
+    """
+    @abstractmethod
+    def get_gaps(self, size: int) -> np.ndarray:
+        """
+        Returns the gaps (in seconds) before each of the given number of lines
+        """
+        pass
+
+
+class ConstantProfile(LoadProfile):
+    def __init__(self, gap: float):
+        self.gap = gap
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        return np.full(size, float(self.gap))
+
+
+class RampProfile(LoadProfile):
+    """
+    A rate (in events per second) that changes linearly in time over the lines
+    """
+    def __init__(self, from_rate: float, to_rate: float):
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        events = np.arange(1, size + 1)
+        if self.from_rate == self.to_rate:
+            return np.diff(events / self.from_rate, prepend=0)
+        # the events sent until time t are from_rate * t + slope * t^2 / 2,
+        # and all of them are sent by the duration of the ramp
+        duration = 2 * size / (self.from_rate + self.to_rate)
+        slope = (self.to_rate - self.from_rate) / duration
+        times = (np.sqrt(self.from_rate ** 2 + 2 * slope * events) -
+                 self.from_rate) / slope
+        return np.diff(times, prepend=0)
+
+
+class SineProfile(LoadProfile):
+    """
+    A rate (in events per second) oscillating around its mean in time, by the
+    given relative amplitude (below 1) and period (in seconds)
+    """
+    # the number of points per period the events times are interpolated by
+    RESOLUTION = 256
+
+    def __init__(self, rate: float, amplitude: float, period: float):
+        self.rate = rate
+        self.amplitude = amplitude
+        self.period = period
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        duration = size / self.rate + self.period
+        times = np.linspace(0, duration, int(duration / self.period *
+                                             self.RESOLUTION) + 2)
+        # the number of events sent until every time
+        omega = 2 * np.pi / self.period
+        events = self.rate * (times + self.amplitude / omega *
+                              (1 - np.cos(omega * times)))
+        return np.diff(np.interp(np.arange(1, size + 1), events, times),
+                       prepend=0)
+
+
+class BurstyProfile(LoadProfile):
+    """
+    Alternates between calm periods at the rate and bursts at the burst rate
+    (in events per second), of random numbers of lines around the given means
+    """
+    def __init__(self, rate: float, burst_rate: float, burst_length: float,
+                 calm_length: float, seed: int = 0):
+        self.rate = rate
+        self.burst_rate = burst_rate
+        self.burst_length = burst_length
+        self.calm_length = calm_length
+        self.seed = seed
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        gaps = np.empty(size)
+        start, burst = 0, False
+        while start < size:
+            length = self.burst_length if burst else self.calm_length
+            end = start + 1 + int(rng.exponential(length))
+            gaps[start:end] = 1 / (self.burst_rate if burst else self.rate)
+            start, burst = end, not burst
+        return gaps
+
+
+class PoissonProfile(LoadProfile):
+    """
+    Sends the lines by a Poisson process whose rate follows the given profile
+    (e.g. a constant rate, or bursts for a Markov modulated process). Given
+    the number of lines, their times are the sorted uniform points of the
+    profile's time, so the duration of the profile is kept
+    """
+    def __init__(self, profile: LoadProfile, seed: int = 0):
+        self.profile = profile
+        self.seed = seed
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        times = np.concatenate([[0], np.cumsum(self.profile.get_gaps(size))])
+        points = np.cumsum(rng.exponential(size=size + 1))
+        events = points[:size] / points[size] * size
+        return np.diff(np.interp(events, np.arange(size + 1), times),
+                       prepend=0)
+
+
+class TraceProfile(LoadProfile):
+    """
+    Replays recorded gaps, one per line of the trace file (the format of
+    ARRIVAL_RATES), scaled by the given factor
+    """
+    def __init__(self, trace_file: str, scale: float = 1):
+        self.trace_file = trace_file
+        self.scale = scale
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        trace = np.loadtxt(self.trace_file, ndmin=1)
+        if len(trace) < size:
+            raise ValueError(f'the trace {self.trace_file} has {len(trace)} '
+                             f'gaps for {size} lines')
+        return trace[:size] * self.scale
+
+
+class SequenceProfile(LoadProfile):
+    """
+    Consecutive profiles, over the given percents of the lines. The lines
+    after all of them are by the last one
+    """
+    def __init__(self, segments: typing.List[typing.Tuple[float,
+                                                          LoadProfile]]):
+        self.segments = segments
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        gaps = []
+        start = 0
+        for i, (length, profile) in enumerate(self.segments):
+            end = size if i == len(self.segments) - 1 else \
+                min(size, start + int(size * length / 100))
+            gaps.append(profile.get_gaps(end - start))
+            start = end
+        return np.concatenate(gaps)
+
+
+class SumProfile(LoadProfile):
+    """
+    Adds the gaps of the profiles, e.g. a base rate and a recorded trace
+    """
+    def __init__(self, profiles: typing.List[LoadProfile]):
+        self.profiles = profiles
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        return sum(profile.get_gaps(size) for profile in self.profiles)
+
+
+class PeaksProfile(LoadProfile):
+    """
+    The lines of the load peaks (given like BOOST, in percents of the lines)
+    are by the load profile, and the other lines by the base profile
+    """
+    def __init__(self, base: LoadProfile, load: LoadProfile,
+                 boost_percents: typing.Dict[int, int]):
+        self.base = base
+        self.load = load
+        self.boost_percents = boost_percents
+
+    def get_gaps(self, size: int) -> np.ndarray:
+        in_peak = np.zeros(size, dtype=bool)
+        for index, length in get_boost(self.boost_percents, size).items():
+            in_peak[index:index + length] = True
+        return np.where(in_peak, self.load.get_gaps(size),
+                        self.base.get_gaps(size))
+
+
+def parse_load_profile(spec: typing.Dict) -> LoadProfile:
+    """
+    Creates a load profile from its JSON declaration, by its kind:
+    constant (rate or gap), ramp (from_rate, to_rate), sine (rate, amplitude,
+    period), bursty (rate, burst_rate, burst_length, calm_length), poisson
+    (rate or profile), trace (file, scale), sequence (segments of length and
+    profile), sum (profiles) and peaks (base, load, boost)
+    """
+    kind = spec['kind']
+    seed = spec.get('seed', 0)
+    if kind == 'constant':
+        return ConstantProfile(spec['gap'] if 'gap' in spec else
+                               1 / spec['rate'])
+    if kind == 'ramp':
+        return RampProfile(spec['from_rate'], spec['to_rate'])
+    if kind == 'sine':
+        return SineProfile(spec['rate'], spec['amplitude'], spec['period'])
+    if kind == 'bursty':
+        return BurstyProfile(spec['rate'], spec['burst_rate'],
+                             spec['burst_length'], spec['calm_length'], seed)
+    if kind == 'poisson':
+        profile = parse_load_profile(spec['profile']) if 'profile' in spec \
+            else ConstantProfile(1 / spec['rate'])
+        return PoissonProfile(profile, seed)
+    if kind == 'trace':
+        return TraceProfile(spec['file'], spec.get('scale', 1))
+    if kind == 'sequence':
+        return SequenceProfile([(segment['length'],
+                                 parse_load_profile(segment['profile'])) for
+                                segment in spec['segments']])
+    if kind == 'sum':
+        return SumProfile([parse_load_profile(profile) for profile in
+                           spec['profiles']])
+    if kind == 'peaks':
+        return PeaksProfile(parse_load_profile(spec['base']),
+                            parse_load_profile(spec['load']),
+                            spec['boost'])
+    raise ValueError(f'unknown load profile kind {kind}')
+
+
+def get_send_times(profile: LoadProfile, size: int, start: int) -> \
+        np.ndarray:
+    """
+    Returns the send time (in seconds) of every event from the given start
+    event, relative to the start of sending them. The profile is of all the
+    events, so the peaks and the trace keep their positions
+    """
+    return np.cumsum(profile.get_gaps(size)[start:])
@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+
+
+class ReplayScheduler:
+    """
+    This class paces the replay of events by absolute deadlines: the deadline
+    of every event is its precomputed send time (see load_profile.py) from the
+    start, so the errors of the waits do not accumulate, and the events that
+    are already due are sent together rather than one by one.
+    A deadline is waited for by sleeping until shortly before it and spinning
+    for the rest, since a sleep alone overshoots by the timer granularity of
+    the OS. If the sender falls behind (e.g. while waiting for credit), it
+    catches up by sending the overdue events at once, so the offered load is
+    the configured one.
+    """
+    def __init__(self, send_times: np.ndarray, spin_sec: float):
+        self.send_times = send_times
+        self.spin_sec = spin_sec
+        self.start_time = None
+        self.deadline = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+
+    def is_due(self, i: int) -> bool:
+        """
+        Schedules the i-th event from the start, and returns whether its
+        deadline has already passed
+        """
+        self.deadline = self.start_time + self.send_times[i]
+        return time.perf_counter() >= self.deadline
+
+    def wait(self):
+        """
+        Waits until the deadline of the last scheduled event
+        """
+        remaining = self.deadline - time.perf_counter()
+        if remaining > self.spin_sec:
+            time.sleep(remaining - self.spin_sec)
+        while time.perf_counter() < self.deadline:
+            continue